@@ -15,12 +15,23 @@ target_metadata = Base.metadata
 config.set_main_option('sqlalchemy.url', DATABASE_URL)
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == 'column' and name == 'search_vector':
+        return False
+    if type_ == 'index' and name == 'ix_vacancies_search_vector':
+        return False
+    if type_ == 'table' and name.startswith('vacancies_fts'):
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
         url=url,
         target_metadata=target_metadata,
         literal_binds=True,
+        include_object=include_object,
         dialect_opts={"paramstyle": "named"},
     )
 
@@ -37,7 +48,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
@@ -0,0 +1,25 @@
+"""add hr reply threading
+
+Revision ID: 2f7c9e4a6b13
+Revises: 8d2a6f4e1c75
+Create Date: 2026-10-17 19:03:27.915408
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '2f7c9e4a6b13'
+down_revision = '8d2a6f4e1c75'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_hrs_telegram_id'), 'hrs', ['telegram_id'], unique=False)
+    op.add_column('outbox', sa.Column('sent_message_id', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('outbox', 'sent_message_id')
+    op.drop_index(op.f('ix_hrs_telegram_id'), table_name='hrs')
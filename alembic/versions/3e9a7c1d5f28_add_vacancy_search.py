@@ -0,0 +1,57 @@
+"""add vacancy search
+
+Revision ID: 3e9a7c1d5f28
+Revises: a4d8b2f6e931
+Create Date: 2026-10-17 20:37:42.518306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '3e9a7c1d5f28'
+down_revision = 'a4d8b2f6e931'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "ALTER TABLE vacancies ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('russian', coalesce(text, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(text, '')), 'B')) STORED"
+        )
+        op.create_index('ix_vacancies_search_vector', 'vacancies', ['search_vector'], unique=False, postgresql_using='gin')
+    else:
+        op.execute(
+            "CREATE VIRTUAL TABLE vacancies_fts USING fts5("
+            "title, text, content='vacancies', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "CREATE TRIGGER vacancies_fts_ai AFTER INSERT ON vacancies BEGIN "
+            "INSERT INTO vacancies_fts(rowid, title, text) VALUES (new.id, new.title, new.text); END"
+        )
+        op.execute(
+            "CREATE TRIGGER vacancies_fts_ad AFTER DELETE ON vacancies BEGIN "
+            "INSERT INTO vacancies_fts(vacancies_fts, rowid, title, text) VALUES ('delete', old.id, old.title, old.text); END"
+        )
+        op.execute(
+            "CREATE TRIGGER vacancies_fts_au AFTER UPDATE OF title, text ON vacancies BEGIN "
+            "INSERT INTO vacancies_fts(vacancies_fts, rowid, title, text) VALUES ('delete', old.id, old.title, old.text); "
+            "INSERT INTO vacancies_fts(rowid, title, text) VALUES (new.id, new.title, new.text); END"
+        )
+        op.execute("INSERT INTO vacancies_fts(vacancies_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_vacancies_search_vector', table_name='vacancies', postgresql_using='gin')
+        op.drop_column('vacancies', 'search_vector')
+    else:
+        op.execute("DROP TRIGGER vacancies_fts_au")
+        op.execute("DROP TRIGGER vacancies_fts_ad")
+        op.execute("DROP TRIGGER vacancies_fts_ai")
+        op.execute("DROP TABLE vacancies_fts")
@@ -0,0 +1,28 @@
+"""add messages unique index
+
+Revision ID: 4e8b1f3c9a07
+Revises: 9c41d7a2e5b8
+Create Date: 2026-10-17 11:03:47.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '4e8b1f3c9a07'
+down_revision = '9c41d7a2e5b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "DELETE FROM messages WHERE id NOT IN ("
+        "SELECT MIN(id) FROM messages GROUP BY chat_id, telegram_id"
+        ")"
+    )
+    op.create_index('ix_messages_chat_id_telegram_id', 'messages', ['chat_id', 'telegram_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_messages_chat_id_telegram_id', table_name='messages')
@@ -0,0 +1,77 @@
+"""add hourly statistics
+
+Revision ID: 5a93c0e7d24f
+Revises: d71f0a9b3e62
+Create Date: 2026-10-17 15:02:56.381447
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '5a93c0e7d24f'
+down_revision = 'd71f0a9b3e62'
+branch_labels = None
+depends_on = None
+
+
+CHAT_STATS_SQL = (
+    "SELECT chat_id, "
+    "SUM(messages_seen) AS messages_seen, "
+    "SUM(vacancies_found) AS vacancies_found, "
+    "SUM(applied_to_hr + applied_to_host) AS applied, "
+    "SUM(replied_vacancies) AS replied_vacancies, "
+    "1.0 * SUM(replied_vacancies) / NULLIF(SUM(applied_to_hr), 0) AS reply_rate "
+    "FROM statistics_hourly GROUP BY chat_id"
+)
+
+FILTER_STATS_SQL = (
+    "SELECT vacancy_filters.filter_id, "
+    "COUNT(*) AS vacancies, "
+    "COUNT(vacancies.replied_at) AS replied, "
+    "1.0 * COUNT(vacancies.replied_at) / NULLIF(COUNT(vacancies.hr_id), 0) AS reply_rate "
+    "FROM vacancy_filters JOIN vacancies ON vacancies.id = vacancy_filters.vacancy_id "
+    "GROUP BY vacancy_filters.filter_id"
+)
+
+
+def upgrade() -> None:
+    op.create_table('statistics_hourly',
+    sa.Column('hour', sa.DateTime(), nullable=False),
+    sa.Column('chat_id', sa.Integer(), nullable=False),
+    sa.Column('messages_seen', sa.Integer(), nullable=False),
+    sa.Column('vacancies_found', sa.Integer(), nullable=False),
+    sa.Column('applied_to_hr', sa.Integer(), nullable=False),
+    sa.Column('applied_to_host', sa.Integer(), nullable=False),
+    sa.Column('replied_vacancies', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['chat_id'], ['chats.id'], ),
+    sa.PrimaryKeyConstraint('hour', 'chat_id')
+    )
+    op.create_table('vacancy_filters',
+    sa.Column('vacancy_id', sa.Integer(), nullable=False),
+    sa.Column('filter_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['filter_id'], ['filters.id'], ),
+    sa.ForeignKeyConstraint(['vacancy_id'], ['vacancies.id'], ),
+    sa.PrimaryKeyConstraint('vacancy_id', 'filter_id')
+    )
+    op.create_index(op.f('ix_vacancy_filters_filter_id'), 'vacancy_filters', ['filter_id'], unique=False)
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(f"CREATE MATERIALIZED VIEW chat_stats AS {CHAT_STATS_SQL}")
+        op.execute("CREATE UNIQUE INDEX ix_chat_stats_chat_id ON chat_stats (chat_id)")
+        op.execute(f"CREATE MATERIALIZED VIEW filter_stats AS {FILTER_STATS_SQL}")
+        op.execute("CREATE UNIQUE INDEX ix_filter_stats_filter_id ON filter_stats (filter_id)")
+    else:
+        op.execute(f"CREATE VIEW chat_stats AS {CHAT_STATS_SQL}")
+        op.execute(f"CREATE VIEW filter_stats AS {FILTER_STATS_SQL}")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP MATERIALIZED VIEW filter_stats")
+        op.execute("DROP MATERIALIZED VIEW chat_stats")
+    else:
+        op.execute("DROP VIEW filter_stats")
+        op.execute("DROP VIEW chat_stats")
+    op.drop_index(op.f('ix_vacancy_filters_filter_id'), table_name='vacancy_filters')
+    op.drop_table('vacancy_filters')
+    op.drop_table('statistics_hourly')
@@ -0,0 +1,33 @@
+"""add ignored contacts
+
+Revision ID: 6c1e4f8a2d93
+Revises: 3e9a7c1d5f28
+Create Date: 2026-10-17 21:14:09.271845
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '6c1e4f8a2d93'
+down_revision = '3e9a7c1d5f28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    ignored_contacts = op.create_table('ignored_contacts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('value', sa.String(length=255), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('value')
+    )
+    op.bulk_insert(ignored_contacts, [
+        {'value': value, 'created_at': datetime.now()} for value in ('best_itjob', 'it_rab', 'freeit_job')
+    ])
+
+
+def downgrade() -> None:
+    op.drop_table('ignored_contacts')
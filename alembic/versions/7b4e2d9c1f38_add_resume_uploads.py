@@ -0,0 +1,33 @@
+"""add resume uploads
+
+Revision ID: 7b4e2d9c1f38
+Revises: e3c58b1a7f90
+Create Date: 2026-10-17 17:02:41.508913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '7b4e2d9c1f38'
+down_revision = 'e3c58b1a7f90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('resume_uploads',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('path', sa.String(length=1024), nullable=False),
+    sa.Column('mtime', sa.BigInteger(), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('file_id', sa.String(length=255), nullable=False),
+    sa.Column('uploaded_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('sha256')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('resume_uploads')
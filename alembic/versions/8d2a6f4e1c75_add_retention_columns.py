@@ -0,0 +1,29 @@
+"""add retention columns
+
+Revision ID: 8d2a6f4e1c75
+Revises: c6f1a8e3b592
+Create Date: 2026-10-17 18:26:53.640172
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '8d2a6f4e1c75'
+down_revision = 'c6f1a8e3b592'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('chats', sa.Column('compacted_message_id', sa.BigInteger(), nullable=True))
+    op.add_column('vacancies', sa.Column('archived_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_messages_created_at', 'messages', ['created_at'], unique=False, postgresql_using='brin')
+    op.create_index('ix_vacancies_created_at', 'vacancies', ['created_at'], unique=False, postgresql_using='brin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_vacancies_created_at', table_name='vacancies')
+    op.drop_index('ix_messages_created_at', table_name='messages')
+    op.drop_column('vacancies', 'archived_at')
+    op.drop_column('chats', 'compacted_message_id')
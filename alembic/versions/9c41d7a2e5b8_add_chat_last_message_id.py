@@ -0,0 +1,28 @@
+"""add chat last message id
+
+Revision ID: 9c41d7a2e5b8
+Revises: 0311ef3863ba
+Create Date: 2026-10-17 10:12:04.518233
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '9c41d7a2e5b8'
+down_revision = '0311ef3863ba'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('chats', sa.Column('last_message_id', sa.BigInteger(), nullable=True))
+    op.execute(
+        "UPDATE chats SET last_message_id = ("
+        "SELECT MAX(messages.telegram_id) FROM messages WHERE messages.chat_id = chats.id"
+        ")"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('chats', 'last_message_id')
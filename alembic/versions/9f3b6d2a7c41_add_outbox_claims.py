@@ -0,0 +1,25 @@
+"""add outbox claims
+
+Revision ID: 9f3b6d2a7c41
+Revises: 6c1e4f8a2d93
+Create Date: 2026-10-18 09:26:47.519302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '9f3b6d2a7c41'
+down_revision = '6c1e4f8a2d93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('outbox', sa.Column('claimed_by', sa.String(length=64), nullable=True))
+    op.add_column('outbox', sa.Column('claimed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('outbox', 'claimed_at')
+    op.drop_column('outbox', 'claimed_by')
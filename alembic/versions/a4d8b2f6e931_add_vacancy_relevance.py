@@ -0,0 +1,34 @@
+"""add vacancy relevance
+
+Revision ID: a4d8b2f6e931
+Revises: 2f7c9e4a6b13
+Create Date: 2026-10-17 19:48:15.362084
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'a4d8b2f6e931'
+down_revision = '2f7c9e4a6b13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('relevance_models',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('n_docs', sa.Integer(), nullable=False),
+    sa.Column('last_vacancy_id', sa.Integer(), nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.add_column('vacancies', sa.Column('relevance', sa.Float(), nullable=True))
+    op.add_column('vacancies', sa.Column('combined_score', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('vacancies', 'combined_score')
+    op.drop_column('vacancies', 'relevance')
+    op.drop_table('relevance_models')
@@ -0,0 +1,37 @@
+"""add outbox table
+
+Revision ID: b2d6e8f14c3a
+Revises: 4e8b1f3c9a07
+Create Date: 2026-10-17 12:20:31.447910
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'b2d6e8f14c3a'
+down_revision = '4e8b1f3c9a07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('outbox',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('vacancy_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['vacancy_id'], ['vacancies.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('vacancy_id')
+    )
+    op.create_index(op.f('ix_outbox_status'), 'outbox', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_outbox_status'), table_name='outbox')
+    op.drop_table('outbox')
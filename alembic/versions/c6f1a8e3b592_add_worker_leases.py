@@ -0,0 +1,45 @@
+"""add worker leases
+
+Revision ID: c6f1a8e3b592
+Revises: 7b4e2d9c1f38
+Create Date: 2026-10-17 17:41:09.227614
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'c6f1a8e3b592'
+down_revision = '7b4e2d9c1f38'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('workers',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('heartbeat_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.create_table('worker_chats',
+    sa.Column('worker', sa.String(length=64), nullable=False),
+    sa.Column('chat_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['chat_id'], ['chats.id'], ),
+    sa.PrimaryKeyConstraint('worker', 'chat_id')
+    )
+    op.create_index(op.f('ix_worker_chats_chat_id'), 'worker_chats', ['chat_id'], unique=False)
+    op.add_column('chats', sa.Column('lease_owner', sa.String(length=64), nullable=True))
+    op.add_column('chats', sa.Column('lease_expires_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_chats_lease_owner'), 'chats', ['lease_owner'], unique=False)
+    op.add_column('hrs', sa.Column('account', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('hrs', 'account')
+    op.drop_index(op.f('ix_chats_lease_owner'), table_name='chats')
+    op.drop_column('chats', 'lease_expires_at')
+    op.drop_column('chats', 'lease_owner')
+    op.drop_index(op.f('ix_worker_chats_chat_id'), table_name='worker_chats')
+    op.drop_table('worker_chats')
+    op.drop_table('workers')
@@ -0,0 +1,70 @@
+"""add vacancy fingerprints
+
+Revision ID: d71f0a9b3e62
+Revises: b2d6e8f14c3a
+Create Date: 2026-10-17 13:41:09.120586
+
+"""
+import re
+import hashlib
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'd71f0a9b3e62'
+down_revision = 'b2d6e8f14c3a'
+branch_labels = None
+depends_on = None
+
+HASHTAG_PATTERN = re.compile(r'(?<!\w)#\w+')
+NON_WORD_PATTERN = re.compile(r'[^\w]+')
+SIMHASH_BITS = 64
+SIMHASH_MIN_TOKENS = 8
+
+
+def fingerprint(text):
+    normalized = NON_WORD_PATTERN.sub(' ', HASHTAG_PATTERN.sub(' ', (text or '').lower())).strip()
+    text_hash = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+    tokens = normalized.split()
+    if len(tokens) < SIMHASH_MIN_TOKENS:
+        return text_hash, None
+    vector = [0] * SIMHASH_BITS
+    for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+        h = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            vector[bit] += 1 if h >> bit & 1 else -1
+    value = sum(1 << bit for bit in range(SIMHASH_BITS) if vector[bit] > 0)
+    if value >= 1 << (SIMHASH_BITS - 1):
+        value -= 1 << SIMHASH_BITS
+    return text_hash, value
+
+
+def upgrade() -> None:
+    op.add_column('vacancies', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('vacancies', sa.Column('simhash', sa.BigInteger(), nullable=True))
+    connection = op.get_bind()
+    vacancies = sa.table(
+        'vacancies',
+        sa.column('id', sa.Integer),
+        sa.column('text', sa.Text),
+        sa.column('content_hash', sa.String),
+        sa.column('simhash', sa.BigInteger),
+    )
+    seen = set()
+    rows = connection.execute(sa.select(vacancies.c.id, vacancies.c.text).order_by(vacancies.c.id)).fetchall()
+    for vacancy_id, text in rows:
+        text_hash, text_simhash = fingerprint(text)
+        if text_hash in seen:
+            text_hash = None
+        else:
+            seen.add(text_hash)
+        connection.execute(
+            vacancies.update().where(vacancies.c.id == vacancy_id).values(content_hash=text_hash, simhash=text_simhash)
+        )
+    op.create_index(op.f('ix_vacancies_content_hash'), 'vacancies', ['content_hash'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_vacancies_content_hash'), table_name='vacancies')
+    op.drop_column('vacancies', 'simhash')
+    op.drop_column('vacancies', 'content_hash')
@@ -0,0 +1,23 @@
+"""add vacancy markdown file
+
+Revision ID: e3c58b1a7f90
+Revises: 5a93c0e7d24f
+Create Date: 2026-10-17 16:18:12.774305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'e3c58b1a7f90'
+down_revision = '5a93c0e7d24f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('vacancies', sa.Column('markdown_file', sa.String(length=255), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('vacancies', 'markdown_file')
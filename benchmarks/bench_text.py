@@ -0,0 +1,126 @@
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tracemalloc
+from pathlib import Path
+from bot import JobBot
+from contacts import extract_contacts, pick_usernames
+from matcher import FilterMatcher
+from parsing import ParsedMessage, extract_title
+from text_utils import remove_emojis, sanitize_filename
+from benchmarks.corpus import make_messages, make_filters
+
+BASELINE_PATH = Path(__file__).with_name('baseline.json')
+FILTER_COUNTS = (10, 100, 1000)
+
+
+def make_bot(filters=()):
+    bot = JobBot.__new__(JobBot)
+    bot.matcher = FilterMatcher(filters)
+    bot.ignored_contacts = frozenset(['best_itjob', 'it_rab', 'freeit_job'])
+    bot.filters_loaded_at = time.monotonic()
+    bot.filters_reload_interval = float('inf')
+    return bot
+
+
+def make_cases(messages, loop):
+    bot = make_bot()
+    texts = [bot._get_message_text(message) for message in messages]
+    parsed = [ParsedMessage(text) for text in texts]
+    titles = [message.title for message in parsed]
+    cases = {
+        'get_message_text': lambda: [bot._get_message_text(message) for message in messages],
+        'parse_message': lambda: [bot._parse_message(message) for message in messages],
+        'extract_title': lambda: [extract_title(text) for text in texts],
+        'remove_emojis': lambda: [remove_emojis(text) for text in texts],
+        'extract_contacts': lambda: [extract_contacts(text) for text in texts],
+        'pick_usernames': lambda: [pick_usernames(message.contacts, bot.ignored_contacts) for message in parsed],
+        'simhash': lambda: [ParsedMessage(text).simhash for text in texts],
+        'sanitize_filename': lambda: [sanitize_filename(title) for title in titles],
+    }
+    for count in FILTER_COUNTS:
+        scoring_bot = make_bot(make_filters(count))
+        cases[f'validate_vacancy[{count}]'] = (
+            lambda b=scoring_bot: loop.run_until_complete(_each(b._validate_vacancy, parsed, None))
+        )
+    return cases
+
+
+async def _each(func, items, *args):
+    for item in items:
+        await func(item, *args)
+
+
+def measure(func, ops, min_time):
+    func()
+    passes = 0
+    started = time.perf_counter()
+    while True:
+        func()
+        passes += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'ops_per_sec': passes * ops / elapsed, 'peak_bytes_per_op': peak / ops}
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        ratio = result['ops_per_sec'] / previous['ops_per_sec']
+        result['vs_baseline'] = ratio
+        if ratio < 1 - tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark text-processing hot paths")
+    parser.add_argument('--messages', type=int, default=500)
+    parser.add_argument('--min-time', type=float, default=1.0)
+    parser.add_argument('--only', help="run only cases whose name contains this string")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--save', action='store_true', help="save results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.1)
+    args = parser.parse_args()
+
+    messages = make_messages(args.messages)
+    loop = asyncio.new_event_loop()
+    results = {}
+    for name, func in make_cases(messages, loop).items():
+        if args.only and args.only not in name:
+            continue
+        results[name] = measure(func, len(messages), args.min_time)
+    loop.close()
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    regressions = compare(results, baseline, args.tolerance)
+    print(f"{'case':<26}{'ops/s':>14}{'peak B/op':>12}{'vs baseline':>14}")
+    for name, result in results.items():
+        ratio = result.get('vs_baseline')
+        ratio_text = f"{ratio:.2f}x" if ratio else "-"
+        print(f"{name:<26}{result['ops_per_sec']:>14,.0f}{result['peak_bytes_per_op']:>12,.0f}{ratio_text:>14}")
+
+    if args.save:
+        baseline.update({
+            name: {key: value for key, value in result.items() if key != 'vs_baseline'}
+            for name, result in results.items()
+        })
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True))
+        print(f"Baseline saved to {args.baseline}")
+    elif regressions:
+        print(f"Regressions over {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
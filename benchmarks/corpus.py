@@ -0,0 +1,110 @@
+import random
+from types import SimpleNamespace
+from pyrogram.enums import MessageEntityType
+
+
+TITLES = [
+    "🔥 Senior Python Developer",
+    "Middle Backend-разработчик (Python/Django)",
+    "💼 Вакансия: DevOps инженер",
+    "Lead Go Developer 🚀",
+    "QA Automation Engineer (Python)",
+    "Junior+ Frontend разработчик React",
+    "🟢 Data Engineer / ETL",
+    "Team Lead C++ / CI/CD",
+    "Android-разработчик (Kotlin) 📱",
+    "ML Engineer — NLP",
+]
+
+PARAGRAPHS = [
+    "Мы ищем опытного разработчика в команду продукта. Удалёнка или офис в Москве, гибкий график.",
+    "We are a fast-growing fintech startup looking for an engineer to join our platform team. Fully remote.",
+    "Требования: опыт от 3 лет, Python 3.10+, Django/FastAPI, PostgreSQL, Redis, Docker, k8s, CI/CD.",
+    "Requirements: 4+ years of commercial experience, asyncio, SQLAlchemy, Kafka, AWS, strong English.",
+    "Условия: зп 250 000 - 400 000 ₽ на руки, ДМС, оплата обучения, техника на выбор 💻",
+    "We offer: $4000-6000 gross, stock options, 28 days of paid vacation, home office budget ✨",
+    "Задачи: разработка микросервисов, code review, участие в архитектурных решениях, менторство.",
+    "Stack: Go, gRPC, ClickHouse, C#, .NET, TypeScript, Vue, Terraform 🛠",
+]
+
+CONTACTS = [
+    "Пишите в ТГ: @{username}",
+    "Контакт для связи — @{username} 📩",
+    "CV to @{username} or hr@company.io",
+    "Откликнуться: @best_itjob | HR: @{username}",
+    "Подробнее по [ссылке](https://career.example.com/jobs/{n})",
+]
+
+HASHTAGS = ["#вакансия", "#python", "#remote", "#удаленка", "#job", "#backend", "#senior", "#middle"]
+
+FILTER_TERMS = [
+    "python", "django", "fastapi", "flask", "asyncio", "sqlalchemy", "postgres", "postgresql", "redis",
+    "docker", "k8s", "kubernetes", "ci/cd", "c++", "c#", "go", "golang", "kafka", "rabbitmq", "aws",
+    "удаленка", "удалёнка", "remote", "senior", "middle", "lead", "backend", "бэкенд", "бекенд", "api",
+    "микросервис", "clickhouse", "grpc", "linux", "git", "pytest", "celery", "typescript", "react",
+]
+
+
+def _username(rng):
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return 'hr_' + ''.join(rng.choice(letters) for _ in range(rng.randint(4, 10)))
+
+
+def _post(rng):
+    title = rng.choice(TITLES)
+    paragraphs = rng.sample(PARAGRAPHS, rng.randint(2, 5))
+    contact = rng.choice(CONTACTS).format(username=_username(rng), n=rng.randint(1, 9999))
+    tags = ' '.join(rng.sample(HASHTAGS, rng.randint(0, 4)))
+    return '\n\n'.join([title] + paragraphs + [contact, tags]).strip()
+
+
+def _entities(rng, text):
+    entities = []
+    offset = 0
+    while offset < len(text) - 10 and len(entities) < 6:
+        offset += rng.randint(5, 120)
+        length = rng.randint(3, 12)
+        if offset + length >= len(text):
+            break
+        if rng.random() < 0.3:
+            entities.append(SimpleNamespace(
+                offset=offset, length=length, type=MessageEntityType.TEXT_LINK, url="https://example.com/job"
+            ))
+        else:
+            entities.append(SimpleNamespace(offset=offset, length=length, type=MessageEntityType.BOLD, url=None))
+        offset += length
+    return entities
+
+
+def make_messages(count=500, seed=42):
+    rng = random.Random(seed)
+    messages = []
+    for i in range(count):
+        text = _post(rng)
+        entities = _entities(rng, text)
+        if rng.random() < 0.2:
+            messages.append(SimpleNamespace(
+                id=i, text=None, caption=text, entities=None, caption_entities=entities or None
+            ))
+        else:
+            messages.append(SimpleNamespace(
+                id=i, text=text, caption=None, entities=entities or None, caption_entities=None
+            ))
+    return messages
+
+
+def make_filters(count, seed=42):
+    rng = random.Random(seed)
+    filters = []
+    for i in range(count):
+        if i < len(FILTER_TERMS):
+            variants = [FILTER_TERMS[i]]
+        else:
+            variants = [
+                ''.join(rng.choice('abcdefghijklmnopqrstuvwxyzабвгдежзиклмнопрст') for _ in range(rng.randint(3, 9)))
+                for _ in range(rng.randint(1, 4))
+            ]
+            if rng.random() < 0.3:
+                variants.append(rng.choice(FILTER_TERMS))
+        filters.append(SimpleNamespace(id=i + 1, text=', '.join(variants), weight=rng.randint(1, 5), is_active=True))
+    return filters
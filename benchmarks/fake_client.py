@@ -0,0 +1,83 @@
+import random
+import asyncio
+from collections import defaultdict
+from types import SimpleNamespace
+from pyrogram.enums import ChatType
+from pyrogram.errors import FloodWait, UsernameNotOccupied
+
+
+class FakeClient:
+    def __init__(self, chats, latency=0.0, flood_rate=0.0, flood_seconds=1, seed=42):
+        self.chats = chats
+        self.latency = latency
+        self.flood_rate = flood_rate
+        self.flood_seconds = flood_seconds
+        self.rng = random.Random(seed)
+        self.history = defaultdict(list)
+        self.handlers = []
+        self.users = {}
+        self.sent = []
+        self.calls = defaultdict(int)
+        self.flood_waits = 0
+
+    async def _call(self, name):
+        self.calls[name] += 1
+        if self.latency:
+            await asyncio.sleep(self.rng.uniform(0, 2 * self.latency))
+        if self.flood_rate and self.rng.random() < self.flood_rate:
+            self.flood_waits += 1
+            raise FloodWait(value=self.flood_seconds)
+
+    def add_handler(self, handler, group=0):
+        self.handlers.append(handler)
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    def publish(self, chat_id, message_id, text, entities=None):
+        chat = SimpleNamespace(id=chat_id, type=ChatType.CHANNEL, title=self.chats[chat_id])
+        message = SimpleNamespace(
+            id=message_id, chat=chat, text=text, caption=None, entities=entities,
+            caption_entities=None, from_user=None
+        )
+        self.history[chat_id].append(message)
+        return message
+
+    async def get_dialogs(self):
+        await self._call('get_dialogs')
+        for chat_id, title in self.chats.items():
+            yield SimpleNamespace(chat=SimpleNamespace(id=chat_id, type=ChatType.CHANNEL, title=title))
+
+    async def get_chat_history(self, chat_id, limit=0):
+        await self._call('get_chat_history')
+        messages = self.history[chat_id]
+        for message in reversed(messages[-limit:] if limit else messages):
+            yield message
+
+    async def get_users(self, key):
+        await self._call('get_users')
+        if isinstance(key, str):
+            if not key.startswith('hr_'):
+                raise UsernameNotOccupied()
+            user_id = self.users.setdefault(key, 10_000 + len(self.users))
+            username = key
+        else:
+            user_id = key
+            username = next((name for name, uid in self.users.items() if uid == key), None)
+        return SimpleNamespace(id=user_id, username=username, phone_number=None, first_name='HR', last_name=None)
+
+    async def send_message(self, chat_id, text, **kwargs):
+        await self._call('send_message')
+        self.sent.append((chat_id, text))
+        return SimpleNamespace(id=len(self.sent), chat=SimpleNamespace(id=chat_id))
+
+    async def send_document(self, chat_id, document, caption=None, **kwargs):
+        await self._call('send_document')
+        self.sent.append((chat_id, caption))
+        file_id = document if document.startswith('fake-file-') else f"fake-file-{len(self.sent)}"
+        return SimpleNamespace(
+            id=len(self.sent), chat=SimpleNamespace(id=chat_id), document=SimpleNamespace(file_id=file_id)
+        )
@@ -0,0 +1,185 @@
+import os
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+from datetime import datetime
+from pathlib import Path
+from logging_setup import setup_logging
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Replay channel traffic through JobBot with a fake Telegram client")
+    parser.add_argument('--database-url', help="defaults to a fresh SQLite file in a temp directory")
+    parser.add_argument('--input', type=Path, help="JSON lines with chat_id and text; generated when omitted")
+    parser.add_argument('--messages', type=int, default=500)
+    parser.add_argument('--chats', type=int, default=50)
+    parser.add_argument('--filters', type=int, default=100)
+    parser.add_argument('--rate', type=float, default=50.0, help="messages published per second")
+    parser.add_argument('--latency', type=float, default=0.0, help="mean fake API latency in seconds")
+    parser.add_argument('--flood-rate', type=float, default=0.0, help="probability of FloodWait per API call")
+    parser.add_argument('--flood-seconds', type=int, default=1)
+    parser.add_argument('--mode', choices=['poll', 'push'], default='poll')
+    parser.add_argument('--poll-interval', type=int, default=1)
+    parser.add_argument('--threshold', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=300.0)
+    return parser.parse_args()
+
+
+def configure_environment(args):
+    if not args.database_url:
+        args.database_url = f"sqlite:///{tempfile.mkdtemp(prefix='replay-db-')}/replay.db"
+    os.environ['DATABASE_URL'] = args.database_url
+    os.environ.setdefault('VACANCY_FILE_PATH', tempfile.mkdtemp(prefix='replay-files-'))
+    os.environ['INGEST_MODE'] = args.mode
+    os.environ['POLL_INTERVAL'] = str(args.poll_interval)
+    os.environ.setdefault('POLL_MIN_INTERVAL', str(args.poll_interval))
+    os.environ.setdefault('POLL_MAX_INTERVAL', str(args.poll_interval * 10))
+    os.environ.setdefault('POLL_RATE_WINDOW', '60')
+    os.environ['THRESHOLD'] = str(args.threshold)
+    os.environ['HOST_USERNAME'] = 'hr_host'
+    os.environ.setdefault('SEND_DELAY', '0')
+    os.environ.setdefault('OUTBOX_POLL_INTERVAL', '1')
+    os.environ.setdefault('HISTORY_LIMIT', '100')
+
+
+def load_traffic(args, chat_ids):
+    from benchmarks.corpus import make_messages
+    if args.input:
+        with open(args.input, encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        return [(row['chat_id'], row['text']) for row in rows]
+    messages = make_messages(args.messages)
+    return [(chat_ids[i % len(chat_ids)], message.text or message.caption) for i, message in enumerate(messages)]
+
+
+def seed_database(chat_ids, filter_count):
+    from config import Base, engine, session_scope
+    from sqlalchemy import select
+    from models import Answer, Chat, Filter, Message
+    from benchmarks.corpus import make_filters
+    if engine.dialect.name == 'sqlite':
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with session_scope() as session:
+        if session.scalar(select(Chat.id).limit(1)) or session.scalar(select(Message.id).limit(1)):
+            raise SystemExit(f"{engine.url.render_as_string()} is not empty, replay needs a fresh database")
+        session.add(Answer(title='Replay', text='Hello! Interested in {vacancy_title}', is_active=True))
+        for chat_id in chat_ids:
+            session.add(Chat(telegram_id=chat_id, title=f"Replay chat {chat_id}", is_active=True))
+        for row in make_filters(filter_count):
+            session.add(Filter(title=row.text[:255], text=row.text, weight=row.weight, is_active=True))
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def replay(args):
+    from sqlalchemy import event, func, select
+    from bot import JobBot
+    from config import async_engine, async_session_scope
+    from dedup import fingerprint
+    from models import Message, Outbox, Vacancy
+    from benchmarks.fake_client import FakeClient
+
+    chat_ids = [-1000000000000 - i for i in range(args.chats)]
+    traffic = load_traffic(args, chat_ids)
+    seed_database(chat_ids, args.filters)
+
+    client = FakeClient(
+        {chat_id: f"Replay chat {chat_id}" for chat_id in set(chat_ids) | {chat_id for chat_id, _ in traffic}},
+        latency=args.latency,
+        flood_rate=args.flood_rate,
+        flood_seconds=args.flood_seconds,
+    )
+
+    handled = 0
+
+    class ReplayBot(JobBot):
+        def _setup_client(self):
+            return client
+
+        async def _handle_chat_message(self, *args, **kwargs):
+            nonlocal handled
+            try:
+                return await super()._handle_chat_message(*args, **kwargs)
+            finally:
+                handled += 1
+
+    queries = 0
+
+    def count_query(*_):
+        nonlocal queries
+        queries += 1
+
+    event.listen(async_engine.sync_engine, 'before_cursor_execute', count_query)
+
+    bot = ReplayBot()
+    await bot.start()
+    published = {}
+    started = time.monotonic()
+    interval = 1 / args.rate if args.rate else 0
+    for message_id, (chat_id, text) in enumerate(traffic, start=1):
+        message = client.publish(chat_id, message_id, text)
+        published[fingerprint(text)[0]] = datetime.now()
+        if args.mode == 'push':
+            asyncio.create_task(bot._handle_channel_message(client, message))
+        if interval:
+            await asyncio.sleep(interval)
+    published_at = time.monotonic()
+
+    while time.monotonic() - started < args.timeout:
+        async with async_session_scope() as session:
+            ingested = await session.scalar(select(func.count(Message.id)))
+            pending = await session.scalar(
+                select(func.count(Outbox.id)).filter(Outbox.status.in_(['pending', 'sending']))
+            )
+        if handled >= len(traffic) and not pending:
+            break
+        await asyncio.sleep(0.5)
+    finished = time.monotonic()
+
+    async with async_session_scope() as session:
+        rows = (await session.execute(
+            select(Vacancy.content_hash, Outbox.sent_at).join(Outbox, Outbox.vacancy_id == Vacancy.id)
+            .filter(Outbox.status == 'sent')
+        )).all()
+    apply_times = [
+        (sent_at - published[content_hash]).total_seconds()
+        for content_hash, sent_at in rows if content_hash in published
+    ]
+
+    await bot.stop()
+    for task in asyncio.all_tasks():
+        if task is not asyncio.current_task():
+            task.cancel()
+
+    elapsed = finished - started
+    print(f"Published {len(traffic)} messages to {len(client.chats)} chats in {published_at - started:.1f}s")
+    print(f"Ingested {ingested} messages in {elapsed:.1f}s ({ingested / elapsed:.1f} msg/s), {handled} analyzed")
+    print(f"Applied {len(apply_times)} vacancies, {pending} still pending")
+    if apply_times:
+        print(
+            f"Time to apply: p50 {percentile(apply_times, 0.5):.2f}s, "
+            f"p95 {percentile(apply_times, 0.95):.2f}s, max {max(apply_times):.2f}s, "
+            f"mean {statistics.mean(apply_times):.2f}s"
+        )
+    print(f"DB queries: {queries} ({queries / max(ingested, 1):.1f} per message)")
+    print(f"API calls: {dict(client.calls)}, FloodWaits injected: {client.flood_waits}")
+
+
+def main():
+    args = parse_args()
+    configure_environment(args)
+    setup_logging()
+    asyncio.run(replay(args))
+
+
+if __name__ == "__main__":
+    main()
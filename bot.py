@@ -1,26 +1,40 @@
 import os
-import re
 import random
 import asyncio
-from datetime import datetime
-from pathlib import Path
+import time
+from collections import Counter
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from pyrogram import Client, filters
+from pyrogram.errors import FloodWait
 from pyrogram.enums import ChatType, ParseMode, MessageEntityType
-from pyrogram.handlers import MessageHandler
-from config import get_logger, session_scope
-from models import Chat, Filter, Vacancy, HR, Answer, Statistic, Message
-
-EMOJI_PATTERN = re.compile(
-    "["
-    "\U0001F600-\U0001F64F"
-    "\U0001F300-\U0001F5FF"
-    "\U0001F680-\U0001F6FF"
-    "\U0001F1E0-\U0001F1FF"
-    "\U00002702-\U000027B0"
-    "\U000024C2-\U0001F251"
-    "]+",
-    flags=re.UNICODE,
+from pyrogram.handlers import MessageHandler, DisconnectHandler
+from sqlalchemy import func, literal, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from config import get_logger, async_session_scope
+from contacts import extract_contacts, pick_usernames
+from dedup import SimHashIndex, normalize_content
+from hr_index import HRIndex
+from logging_setup import log_fields
+from export import MarkdownExporter, render_markdown, get_files_dir
+from matcher import FilterMatcher
+from offload import TextOffload
+from parsing import ParsedMessage, render_entities
+from metrics import (
+    CYCLE_CHATS, CYCLE_DURATION, FLOOD_WAIT, MESSAGES, QUEUE_DEPTH, observe, timed, track_peer_cache
+)
+from peers import PeerCache, NOT_FOUND_ERRORS
+from resume import ResumeFile, STALE_FILE_ID_ERRORS
+from relevance import TfidfModel, combine_score, extract_pdf_text, extract_terms
+from retention import run_retention
+from scheduler import PollScheduler
+from sharding import ShardCoordinator
+from stats import StatsBuffer, COUNTERS as STAT_COUNTERS, refresh_rollups
+from models import (
+    Chat, Filter, Vacancy, HR, Answer, Statistic, StatisticHourly, VacancyFilter, Message, Outbox, ResumeUpload,
+    RelevanceModel, IgnoredContact
 )
 
 load_dotenv()
@@ -28,118 +42,150 @@ load_dotenv()
 logger = get_logger(__name__)
 
 
-USERNAME_IGNORE_LIST = [
-    "best_itjob",
-    "it_rab",
-    "freeIT_job",
-]
-
-IGNORED_PATTERNS = [
-    'ci/cd',
-    'c++',
-    'c#',
-]
-
-
 class JobBot:
     def __init__(self):
         self.api_id = os.getenv("API_ID")
         self.api_hash = os.getenv("API_HASH")
         self.phone_number = os.getenv("PHONE_NUMBER")
         self.password = os.getenv("PASSWORD")
+        self.session_name = os.getenv("SESSION_NAME", "job_bot")
         self.threshold = int(os.getenv("THRESHOLD", "0"))
         self.host_username = os.getenv("HOST_USERNAME")
         self.send_delay = int(os.getenv("SEND_DELAY", "300"))
-        self.statistics_id = self._setup_statistics()
+        self.filters_reload_interval = int(os.getenv("FILTERS_RELOAD_INTERVAL", "60"))
+        self.matcher = FilterMatcher()
+        self.filters_loaded_at = None
+        self.ignored_contacts = frozenset()
+        self.ignored_contacts_loaded_at = None
+        self.ignore_list_reload_interval = int(os.getenv("IGNORE_LIST_RELOAD_INTERVAL", "300"))
+        self.hr_candidates = int(os.getenv("HR_CANDIDATES", "3"))
+        self.ingest_mode = os.getenv("INGEST_MODE", "poll")
+        self.history_limit = int(os.getenv("HISTORY_LIMIT", "100" if self.ingest_mode == "push" else "10"))
+        self.poll_interval = int(os.getenv("POLL_INTERVAL", "120"))
+        self.catch_up_needed = True
+        self.catch_up_requested = asyncio.Event()
+        self.dialogs_listed_at = float('-inf')
+        self.poll_scheduler = PollScheduler(
+            min_interval=int(os.getenv("POLL_MIN_INTERVAL", "30")),
+            max_interval=int(os.getenv("POLL_MAX_INTERVAL", "3600")),
+            history_limit=self.history_limit,
+            coverage=float(os.getenv("POLL_COVERAGE", "0.5")),
+            boost=float(os.getenv("POLL_BOOST", "2")),
+            window=int(os.getenv("POLL_RATE_WINDOW", "86400")),
+        )
+        self.chat_concurrency = int(os.getenv("CHAT_CONCURRENCY", "5"))
+        self.flood_retries = int(os.getenv("FLOOD_RETRIES", "3"))
+        self.flood_until = 0
+        self.sender_count = int(os.getenv("SENDER_COUNT", "1"))
+        self.send_jitter = float(os.getenv("SEND_JITTER", "0.2"))
+        self.max_send_attempts = int(os.getenv("MAX_SEND_ATTEMPTS", "5"))
+        self.retry_base_delay = int(os.getenv("RETRY_BASE_DELAY", "60"))
+        self.retry_max_delay = int(os.getenv("RETRY_MAX_DELAY", "3600"))
+        self.outbox_poll_interval = int(os.getenv("OUTBOX_POLL_INTERVAL", "5"))
+        self.next_send_at = 0
+        self.stats = StatsBuffer()
+        self.stats_flush_interval = int(os.getenv("STATS_FLUSH_INTERVAL", "60"))
+        self.stats_rollup_interval = int(os.getenv("STATS_ROLLUP_INTERVAL", "3600"))
+        self.message_retention_days = int(os.getenv("MESSAGE_RETENTION_DAYS", "30"))
+        self.vacancy_retention_days = int(os.getenv("VACANCY_RETENTION_DAYS", "180"))
+        self.retention_interval = int(os.getenv("RETENTION_INTERVAL", "86400"))
+        self.exporter = MarkdownExporter(get_files_dir())
+        self.markdown_queue = asyncio.Queue()
+        self.statistics_id = None
+        self.sharding = os.getenv("SHARDING", "").lower() in ("1", "true", "yes")
+        self.shard = ShardCoordinator(
+            os.getenv("WORKER_NAME") or self.session_name,
+            lease_ttl=int(os.getenv("LEASE_TTL", "300")),
+        )
+        self.dialog_chat_ids = set()
+        self.active_chats = {}
         self.client = self._setup_client()
+        self.peers = PeerCache(
+            self.client,
+            maxsize=int(os.getenv("PEER_CACHE_SIZE", "4096")),
+            negative_ttl=int(os.getenv("PEER_NEGATIVE_TTL", "3600")),
+        )
+        self.resume = ResumeFile(os.getenv("RESUME_PATH"))
+        self.resume_check_interval = int(os.getenv("RESUME_CHECK_INTERVAL", "60"))
+        self.resume_lock = asyncio.Lock()
+        self.hr_index = HRIndex()
+        self.offload = TextOffload(
+            os.getenv("TEXT_OFFLOAD", "off"),
+            workers=int(os.getenv("OFFLOAD_WORKERS", "0")) or None,
+            min_batch=int(os.getenv("OFFLOAD_MIN_BATCH", "50")),
+        )
+        self.relevance = TfidfModel()
+        self.relevance_weight = float(os.getenv("RELEVANCE_WEIGHT", "0"))
+        self.relevance_cutoff = float(os.getenv("RELEVANCE_CUTOFF", "0.1"))
+        self.relevance_refresh_interval = int(os.getenv("RELEVANCE_REFRESH_INTERVAL", "300"))
+        self.relevance_loaded_at = None
+        self.resume_terms = []
+        self.near_duplicates = SimHashIndex(max_distance=int(os.getenv("NEAR_DUPLICATE_DISTANCE", "3")))
+        self.near_duplicates_last_id = 0
+        self.near_duplicates_refresh_interval = int(os.getenv("NEAR_DUPLICATE_REFRESH_INTERVAL", "30"))
+        self.near_duplicates_loaded_at = None
+        self.near_duplicates_lock = asyncio.Lock()
         self._setup_handlers()
-
-    def _sanitize_filename(self, name):
-        invalid = '<>:"/\\|?*\n\r\t'
-        result = ''.join('_' if ch in invalid else ch for ch in name).strip()
-        result = result[:120].rstrip('.')
-        return result or 'vacancy'
-
-    def _truncate_to_word(self, text, limit):
-        if len(text) <= limit:
-            return text
-        cut = text[:limit]
-        space_idx = cut.rfind(' ')
-        if space_idx == -1:
-            return cut.strip()
-        return cut[:space_idx].strip()
-
-    def _extract_title(self, text):
-        first_line = (text or '').split('\n')[0][:255]
-        first_line = self._remove_emojis(first_line)
-        cleaned = re.sub(r'[^0-9A-Za-zА-Яа-яЁё\s\+\-]', ' ', first_line)
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-        titled = cleaned.title()
-        return titled or 'Vacancy'
-
-    def _remove_emojis(self, text):
-        if not text:
-            return text
-        return EMOJI_PATTERN.sub('', text)
+        track_peer_cache(self.peers)
+        QUEUE_DEPTH.labels('markdown').set_function(self.markdown_queue.qsize)
+        QUEUE_DEPTH.labels('statistics').set_function(lambda: len(self.stats))
 
     def _save_vacancy_markdown(self, vacancy, status='Applied'):
-        custom_path = os.getenv("VACANCY_FILE_PATH")
-        files_dir = Path(custom_path) if custom_path else Path('files')
-        files_dir.mkdir(parents=True, exist_ok=True)
-        title = vacancy.title
-        body = vacancy.text.strip()
-        created = datetime.now().date().isoformat()
-        desc_source = next((p for p in body.split('\n\n') if p.strip()), body)
-        desc_source_clean = self._remove_emojis(desc_source)
-        desc_flat = desc_source_clean.replace('\n', ' ').strip()
-        desc = self._truncate_to_word(desc_flat, 100).strip()
-        if desc:
-            desc = desc[0].upper() + desc[1:].lower()
-            if not desc.endswith('.'):
-                desc += "."
-        filename_base = self._sanitize_filename(title)
-        filename = files_dir / f"{filename_base}.md"
-        counter = 1
-        while filename.exists():
-            filename = files_dir / f"{filename_base} ({counter}).md"
-            counter += 1
         contact = f"https://t.me/{vacancy.hr.username}" if (vacancy.hr and vacancy.hr.username) else ""
-        content = (
-            "---\n"
-            "tags:\n"
-            "  - Vacancy\n"
-            f"desc: {desc}\n"
-            f"score: {vacancy.score}\n"
-            f"contact: {contact}\n"
-            f"status: {status}\n"
-            f"created: {created}\n"
-            "links:\n"
-            "  - \"[[Вакансии]]\"\n"
-            "---\n"
-            f"### {title}\n\n"
-            f"{body}"
-        )
-        try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(content)
-            logger.info(f"Saved vacancy markdown: {filename}")
-        except Exception as e:
-            logger.warning(f"Failed to save vacancy markdown for '{title}': {e}")
+        filename = self.exporter.reserve(vacancy.title)
+        vacancy.markdown_file = filename
+        content = render_markdown(vacancy.title, vacancy.text, vacancy.score, contact, status, datetime.now().date())
+        self.markdown_queue.put_nowait((filename, content))
 
-    def _setup_statistics(self):
-        with session_scope() as session:
-            statistic = session.query(Statistic).first()
+    async def _run_markdown_writer(self):
+        while True:
+            filename, content = await self.markdown_queue.get()
+            try:
+                await asyncio.to_thread(self.exporter.write, filename, content)
+                logger.info(f"Saved vacancy markdown: {filename}")
+            except Exception as e:
+                logger.warning(f"Failed to save vacancy markdown {filename}: {e}")
+            finally:
+                self.markdown_queue.task_done()
+
+    async def _setup_statistics(self):
+        async with async_session_scope() as session:
+            statistic = await session.scalar(select(Statistic).limit(1))
             if not statistic:
                 statistic = Statistic()
                 session.add(statistic)
-                session.commit()
+                await session.commit()
             return statistic.id
 
+    async def _warm_caches(self):
+        async with async_session_scope() as session:
+            hrs = (await session.scalars(select(HR))).all()
+            self.peers.warm(hrs)
+            legacy = await session.execute(select(HR.telegram_id, Vacancy.id, literal(None)).join(
+                HR, Vacancy.hr_id == HR.id
+            ).outerjoin(Outbox, Outbox.vacancy_id == Vacancy.id).filter(Outbox.id == None).order_by(Vacancy.created_at))
+            self.hr_index.warm((), legacy)
+            applications = await session.execute(select(HR.telegram_id, Outbox.vacancy_id, Outbox.sent_message_id).join(
+                Vacancy, Outbox.vacancy_id == Vacancy.id
+            ).join(HR, Vacancy.hr_id == HR.id).filter(Outbox.status == 'sent').order_by(Outbox.sent_at))
+            self.hr_index.warm((hr.telegram_id for hr in hrs), applications)
+            self.near_duplicates_last_id = await session.scalar(select(func.max(Vacancy.id))) or 0
+            self.near_duplicates_loaded_at = time.monotonic()
+            query = select(Vacancy.id, Vacancy.simhash).filter(
+                Vacancy.id <= self.near_duplicates_last_id, Vacancy.simhash.isnot(None), Vacancy.archived_at == None
+            )
+            if self.vacancy_retention_days:
+                cutoff = datetime.now() - timedelta(days=self.vacancy_retention_days)
+                query = query.filter(Vacancy.created_at >= cutoff)
+            rows = await session.stream(query)
+            async for vacancy_id, value in rows:
+                self.near_duplicates.add(vacancy_id, value)
+
     def _setup_client(self):
         sessions_dir = "sessions"
         os.makedirs(sessions_dir, exist_ok=True)
         return Client(
-            "job_bot",
+            self.session_name,
             api_id=self.api_id,
             api_hash=self.api_hash,
             workdir=sessions_dir,
@@ -148,179 +194,460 @@ class JobBot:
         )
     
     def _setup_handlers(self):
-        self.client.add_handler(MessageHandler(self._handle_message, filters=ChatType.PRIVATE))
+        self.client.add_handler(MessageHandler(self._handle_message, filters=filters.private))
+        if self.ingest_mode == "push":
+            self.client.add_handler(MessageHandler(
+                self._handle_channel_message,
+                filters=filters.group | filters.channel
+            ))
+            self.client.add_handler(DisconnectHandler(self._handle_disconnect))
 
-    def _get_message_text(self, message):
-        base_text = message.text or message.caption or ""
+    def _message_content(self, message):
+        text = message.text or message.caption or ""
         entities = message.entities if message.text else message.caption_entities
-        if not entities:
-            return base_text
-        result = []
-        last_offset = 0
-        for entity in sorted(entities, key=lambda e: e.offset):
-            start = entity.offset
-            end = start + entity.length
-            result.append(base_text[last_offset:start])
-            entity_text = base_text[start:end]
-            if entity.type == MessageEntityType.TEXT_LINK and entity.url:
-                result.append(f"[{entity_text}]({entity.url})")
-            else:
-                result.append(entity_text)
-            last_offset = end
-        result.append(base_text[last_offset:])
-        return "".join(result)
+        return text, [
+            (entity.offset, entity.length, entity.url if entity.type == MessageEntityType.TEXT_LINK else None)
+            for entity in entities or ()
+        ]
+
+    @timed('get_message_text')
+    def _get_message_text(self, message):
+        return render_entities(*self._message_content(message))
+
+    @timed('parse_message')
+    def _parse_message(self, message):
+        return ParsedMessage(self._get_message_text(message))
 
     async def _handle_message(self, client, message):
-        logger.info(f"Handling message: {message.text}")
-        with session_scope() as session:
-            if not message.from_user:
-                logger.info(f"Message from non-user: {message.text}")
-                return
-            hr = session.query(HR).filter(
-                HR.telegram_id == message.from_user.id
-            ).first()
-            if hr:
-                vacancy = session.query(Vacancy).filter(
-                    Vacancy.hr_id == hr.id
-                ).order_by(Vacancy.created_at.desc()).first()
-                if vacancy and not vacancy.replied_at:
+        if not message.from_user or message.from_user.id not in self.hr_index:
+            return
+        vacancy_id = self.hr_index.resolve(message.from_user.id, message.reply_to_message_id)
+        if not vacancy_id:
+            return
+        with log_fields(vacancy_id=vacancy_id):
+            async with async_session_scope() as session:
+                vacancy = await session.get(Vacancy, vacancy_id, options=[selectinload(Vacancy.hr)])
+                if not vacancy:
+                    return
+                hr = vacancy.hr
+                if not vacancy.replied_at:
                     vacancy.replied_at = datetime.now()
-                    session.commit()
-                    self._update_statistics(replied_vacancies=1)
-                    message_text = self._get_message_text(message)
-                    hr_link = f"https://t.me/{hr.username}" if hr.username else "no username"
-                    notification = f"Ответ от HR @{hr.username}:\n\n{message_text}"
-                    if vacancy:
-                        notification += f"\n\n**Контакт HR:** [{hr.username}]({hr_link})"
-                        notification += f"\n**Вакансия:** {vacancy.title} ({vacancy.score} баллов)"
-                        notification += f"\n```\n{vacancy.text}\n```"
-                    await self._notify_host(notification)
-                    logger.info(f"Forwarded message from HR @{hr.username} to host")
-                return
+                    await session.commit()
+                    self._update_statistics(vacancy.chat_id, replied_vacancies=1)
+            message_text = self._get_message_text(message)
+            hr_link = f"https://t.me/{hr.username}" if hr.username else "no username"
+            notification = f"Ответ от HR @{hr.username}:\n\n{message_text}"
+            notification += f"\n\n**Контакт HR:** [{hr.username}]({hr_link})"
+            notification += f"\n**Вакансия:** {vacancy.title} ({vacancy.score} баллов)"
+            notification += f"\n```\n{vacancy.text}\n```"
+            await self._notify_host(notification)
+            logger.info("Forwarded message from HR @%s to host", hr.username)
 
     async def _poll_channels(self):
         while True:
             try:
-                await self._check_channels()
-                await asyncio.sleep(120)
+                if self.ingest_mode != "push":
+                    await self._poll_due_chats()
+                    continue
+                if self.catch_up_needed:
+                    self.catch_up_requested.clear()
+                    await self._check_channels()
+                    self.catch_up_needed = self.catch_up_requested.is_set()
+                else:
+                    await self._refresh_active_chats()
+                await self._wait_catch_up(self.poll_interval)
             except Exception as e:
                 logger.error(f"Error polling channels: {e}", exc_info=True)
-                await asyncio.sleep(120)
+                await asyncio.sleep(self.poll_interval)
+
+    async def _wait_catch_up(self, timeout):
+        try:
+            await asyncio.wait_for(self.catch_up_requested.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _handle_disconnect(self, client):
+        logger.info("Disconnected from Telegram, scheduling catch-up")
+        self.catch_up_needed = True
+        self.catch_up_requested.set()
+
+    async def _handle_channel_message(self, client, message):
+        chat_id = self.active_chats.get(message.chat.id)
+        if not chat_id or (self.sharding and chat_id not in self.shard.leased):
+            return
+        async with async_session_scope() as session:
+            chat = await session.get(Chat, chat_id)
+            if not chat or not chat.is_active:
+                return
+            try:
+                recorded = await self._record_messages([message], chat, session, advance=not self.catch_up_needed)
+                await self._handle_chat_messages(recorded, chat, session)
+            except Exception as e:
+                logger.warning("Failed to handle message %s from %s: %s", message.id, chat.telegram_id, e)
+
+    async def _poll_due_chats(self):
+        now = time.monotonic()
+        if self.catch_up_needed or now >= self.dialogs_listed_at + self.poll_interval:
+            catch_up = self.catch_up_needed
+            self.catch_up_requested.clear()
+            active_chat_ids = await self._list_active_chats()
+            async with async_session_scope() as session:
+                activity = await self._get_chat_activity(session)
+            now = time.monotonic()
+            self.dialogs_listed_at = now
+            self.poll_scheduler.sync(active_chat_ids, activity, now)
+            if catch_up:
+                self.poll_scheduler.expedite(now)
+                self.catch_up_needed = self.catch_up_requested.is_set()
+        due = self.poll_scheduler.pop_due(now)
+        if self.sharding:
+            due = [chat_id for chat_id in due if chat_id in self.shard.leased]
+        if due:
+            started = time.monotonic()
+            await self._check_chats(due, reschedule=True)
+            CYCLE_DURATION.observe(time.monotonic() - started)
+            CYCLE_CHATS.set(len(due))
+            logger.info(
+                "Checked %s due chats in %.1fs, %s scheduled", len(due), time.monotonic() - started,
+                len(self.poll_scheduler)
+            )
+        next_due = self.poll_scheduler.next_due()
+        wake_at = self.dialogs_listed_at + self.poll_interval
+        if next_due is not None:
+            wake_at = min(wake_at, next_due)
+        await self._wait_catch_up(max(wake_at - time.monotonic(), 0))
+
+    async def _get_chat_activity(self, session):
+        cutoff = datetime.now() - timedelta(seconds=self.poll_scheduler.window)
+        messages = dict((await session.execute(select(Message.chat_id, func.count()).filter(
+            Message.created_at >= cutoff
+        ).group_by(Message.chat_id))).all())
+        vacancies = dict((await session.execute(select(Vacancy.chat_id, func.count()).filter(
+            Vacancy.created_at >= cutoff
+        ).group_by(Vacancy.chat_id))).all())
+        return {chat_id: (count, vacancies.get(chat_id, 0)) for chat_id, count in messages.items()}
+
+    async def _refresh_active_chats(self):
+        async with async_session_scope() as session:
+            rows = await session.execute(select(Chat.telegram_id, Chat.id).filter(Chat.is_active == True))
+            self.active_chats = dict(rows.all())
+
+    async def _list_active_chats(self):
+        active_chat_ids = []
+        active_chats = {}
+        async with async_session_scope() as session:
+            with observe('list_dialogs'):
+                async for dialog in self.client.get_dialogs():
+                    if dialog.chat.type in [ChatType.CHANNEL, ChatType.SUPERGROUP, ChatType.GROUP]:
+                        chat = await session.scalar(select(Chat).filter(
+                            Chat.telegram_id == dialog.chat.id
+                        ).limit(1))
+                        if not chat:
+                            chat = Chat(
+                                telegram_id=dialog.chat.id,
+                                title=dialog.chat.title or "Unknown",
+                                is_active=False
+                            )
+                            session.add(chat)
+                            await session.commit()
+                            logger.info(f"Added new chat to database: {chat.title} (id: {chat.telegram_id})")
+                        elif chat.is_active:
+                            active_chat_ids.append(chat.id)
+                            active_chats[chat.telegram_id] = chat.id
+            self.active_chats = active_chats
+            if self.sharding:
+                self.dialog_chat_ids = set(active_chat_ids)
+                await self.shard.sync_membership(session, self.dialog_chat_ids)
+                leased = await self.shard.rebalance(session, self.dialog_chat_ids)
+                active_chat_ids = [chat_id for chat_id in active_chat_ids if chat_id in leased]
+        return active_chat_ids
+
+    async def _check_chats(self, chat_ids, reschedule=False):
+        semaphore = asyncio.Semaphore(self.chat_concurrency)
+        await asyncio.gather(*(self._check_chat(chat_id, semaphore, reschedule) for chat_id in chat_ids))
 
     async def _check_channels(self):
         logger.info("Checking channels...")
-        with session_scope() as session:
-            async for dialog in self.client.get_dialogs():
-                if dialog.chat.type in [ChatType.CHANNEL, ChatType.SUPERGROUP, ChatType.GROUP]:
-                    chat = session.query(Chat).filter(
-                        Chat.telegram_id == dialog.chat.id
-                    ).first()
-                    if not chat:
-                        chat = Chat(
-                            telegram_id=dialog.chat.id,
-                            title=dialog.chat.title or "Unknown",
-                            is_active=False
-                        )
-                        session.add(chat)
-                        session.commit()
-                        logger.info(f"Added new chat to database: {chat.title} (id: {chat.telegram_id})")
-                    elif chat.is_active:
-                        await self._get_last_chat_messages(chat, session)
+        started = time.monotonic()
+        active_chat_ids = await self._list_active_chats()
+        listed = time.monotonic()
+        await self._check_chats(active_chat_ids)
+        finished = time.monotonic()
+        CYCLE_DURATION.observe(finished - started)
+        CYCLE_CHATS.set(len(active_chat_ids))
+        logger.info(
+            f"Checked {len(active_chat_ids)} active chats in {finished - started:.1f}s "
+            f"(dialogs: {listed - started:.1f}s, history: {finished - listed:.1f}s)"
+        )
+        logger.info(f"Peer cache: {self.peers.stats()}")
+
+    async def _check_chat(self, chat_id, semaphore, reschedule=False):
+        saturated = False
+        try:
+            async with semaphore:
+                async with async_session_scope() as session:
+                    chat = await session.get(Chat, chat_id)
+                    saturated = await self._get_last_chat_messages(chat, session)
+        finally:
+            if reschedule:
+                self.poll_scheduler.reschedule(chat_id, time.monotonic(), saturated)
+
+    async def _wait_flood(self):
+        delay = self.flood_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
 
     async def _get_last_chat_messages(self, chat, session):
+        messages = await self._fetch_chat_history(chat)
+        saturated = bool(chat.last_message_id) and len(messages) >= self.history_limit
         try:
-            async for message in self.client.get_chat_history(chat.telegram_id, limit=10):
-                existing_message = session.query(Message).filter(
-                    Message.telegram_id == message.id,
-                    Message.chat_id == chat.id
-                ).first()
-                if not existing_message:
-                    new_message = Message(
-                        telegram_id=message.id,
-                        chat_id=chat.id
-                    )
-                    session.add(new_message)
-                    session.commit()
-                    await self._handle_chat_message(message, chat, session)
+            await self._handle_chat_messages(await self._record_messages(messages[::-1], chat, session), chat, session)
         except Exception as e:
-            logger.warning(f"Failed to get last messages for {chat.telegram_id}: {e}")
-
-    async def _handle_chat_message(self, message, chat, session):
-        message_text = self._get_message_text(message)
-        score = await self._validate_vacancy(message_text, session)
-        if score < self.threshold:
-            title = self._extract_title(message_text) if message_text else "Unknown"
-            logger.info(f"Vacancy '{title}' is not valid (score: {score})")
+            logger.warning(f"Failed to handle last messages for {chat.telegram_id}: {e}")
+        return saturated
+
+    @timed('history_fetch')
+    async def _fetch_chat_history(self, chat):
+        for attempt in range(self.flood_retries + 1):
+            try:
+                await self._wait_flood()
+                messages = []
+                async for message in self.client.get_chat_history(chat.telegram_id, limit=self.history_limit):
+                    if chat.last_message_id and message.id <= chat.last_message_id:
+                        break
+                    messages.append(message)
+                return messages
+            except FloodWait as e:
+                self.flood_until = max(self.flood_until, time.monotonic() + e.value)
+                FLOOD_WAIT.labels('history_fetch').inc(e.value)
+                logger.warning(f"FloodWait {e.value}s while fetching {chat.telegram_id} (attempt {attempt + 1})")
+            except Exception as e:
+                logger.warning(f"Failed to get last messages for {chat.telegram_id}: {e}")
+                return []
+        return []
+
+    def _insert(self, session, model):
+        insert = postgresql.insert if session.bind.dialect.name == 'postgresql' else sqlite.insert
+        return insert(model)
+
+    async def _record_messages(self, messages, chat, session, advance=True):
+        if chat.compacted_message_id:
+            messages = [message for message in messages if message.id > chat.compacted_message_id]
+        if not messages:
+            return []
+        stmt = self._insert(session, Message).values([
+            {'telegram_id': message.id, 'chat_id': chat.id} for message in messages
+        ]).on_conflict_do_nothing(
+            index_elements=['chat_id', 'telegram_id']
+        ).returning(Message.telegram_id)
+        inserted = set(await session.scalars(stmt))
+        last_message_id = max(message.id for message in messages)
+        if advance and (not chat.last_message_id or last_message_id > chat.last_message_id):
+            chat.last_message_id = last_message_id
+        await session.commit()
+        self._update_statistics(chat.id, messages_seen=len(inserted))
+        return [message for message in messages if message.id in inserted]
+
+    async def _handle_chat_messages(self, messages, chat, session):
+        if not messages:
             return
-        duplicate = session.query(Vacancy).filter(
-            Vacancy.text == message_text
-        ).first()
+        analyzed = await self._analyze_messages(messages, session)
+        if self.sharding:
+            await self._refresh_near_duplicates(session)
+        relevance = await self._score_relevance([parsed for parsed, _ in analyzed], session)
+        for message, (parsed, result), similarity in zip(messages, analyzed, relevance):
+            with log_fields(chat_id=chat.telegram_id, message_id=message.id):
+                await self._handle_chat_message(parsed, result, chat, session, similarity)
+
+    async def _analyze_messages(self, messages, session):
+        if self.offload.accepts(len(messages)):
+            await self._refresh_matcher(session)
+            contents = [self._message_content(message) for message in messages]
+            return await self.offload.analyze(contents, self.matcher.signature)
+        analyzed = []
+        for message in messages:
+            parsed = self._parse_message(message)
+            analyzed.append((parsed, await self._validate_vacancy(parsed, session)))
+        return analyzed
+
+    async def _handle_chat_message(self, parsed, result, chat, session, relevance=None):
+        score = result.score
+        combined_score = combine_score(score, relevance, self.relevance_weight, self.relevance_cutoff)
+        if combined_score < self.threshold:
+            title = parsed.title if parsed.raw else "Unknown"
+            MESSAGES.labels('invalid').inc()
+            logger.info("Vacancy '%s' is not valid (score: %s, combined: %.1f)", title, score, combined_score)
+            return
+        with observe('dedup'):
+            duplicate = (await session.execute(select(Vacancy.id, Vacancy.title).filter(
+                Vacancy.content_hash == parsed.content_hash
+            ).limit(1))).first()
+            near_duplicate_id = None if duplicate else self.near_duplicates.find(parsed.simhash)
         if duplicate:
-            logger.info(f"Duplicate vacancy skipped: {duplicate.title} (id: {duplicate.id})")
-        else:
-            vacancy = await self._save_vacancy(message_text, chat.id, score, session)
-            status = 'Applied' if vacancy.hr else 'New'
-            self._save_vacancy_markdown(vacancy, status)
-            await self._apply_vacancy(vacancy)
-            logger.info(f"Vacancy {vacancy.title} (id: {vacancy.id}) is applied (score: {score})")
-        return
-
-    async def _validate_vacancy(self, text, session):
-        filters = session.query(Filter).filter(Filter.is_active == True).all()
-        text_lower = text.lower()
-        for i, pattern in enumerate(IGNORED_PATTERNS):
-            text_lower = text_lower.replace(pattern, f'__EXC{i}__')
-        normalized_text = re.sub(r'[^\w\s]', ' ', text_lower)
-        normalized_text = re.sub(r'\s+', ' ', normalized_text).strip()
-        for i, pattern in enumerate(IGNORED_PATTERNS):
-            normalized_text = normalized_text.replace(f'__EXC{i}__', pattern)
-        total_weight = 0
-        found_filters = set()
-        for filter_text in filters:
-            if filter_text.id in found_filters:
-                continue
-            variants = [v.strip() for v in filter_text.text.split(', ')]
-            found = False
-            for variant in variants:
-                if found:
-                    break
-                if variant in normalized_text:
-                    total_weight += filter_text.weight
-                    found_filters.add(filter_text.id)
-                    found = True
-        return total_weight
-
-    async def _save_vacancy(self, text, chat_id, score, session):
-        hr = await self._get_hr(text, session)
-        title = self._extract_title(text)
+            MESSAGES.labels('duplicate').inc()
+            logger.info("Duplicate vacancy skipped: %s (id: %s)", duplicate.title, duplicate.id)
+            return
+        hr = None if near_duplicate_id else await self._get_hr(parsed, session)
+        async with self.near_duplicates_lock:
+            near_duplicate_id = near_duplicate_id or self.near_duplicates.find(parsed.simhash)
+            if near_duplicate_id:
+                MESSAGES.labels('near_duplicate').inc()
+                logger.info("Near-duplicate vacancy skipped (similar to id: %s)", near_duplicate_id)
+                return
+            try:
+                vacancy = await self._save_vacancy(parsed, chat.id, score, hr, session, result.filter_ids, relevance)
+            except IntegrityError:
+                await session.rollback()
+                MESSAGES.labels('duplicate').inc()
+                logger.info("Duplicate vacancy skipped (hash: %s)", parsed.content_hash)
+                return
+            self.near_duplicates.add(vacancy.id, parsed.simhash)
+        self._update_statistics(chat.id, vacancies_found=1)
+        status = 'Applied' if vacancy.hr else 'New'
+        self._save_vacancy_markdown(vacancy, status)
+        session.add(Outbox(vacancy_id=vacancy.id))
+        await session.commit()
+        MESSAGES.labels('queued').inc()
+        with log_fields(vacancy_id=vacancy.id):
+            logger.info("Vacancy %s is queued for applying (score: %s)", vacancy.title, score)
+
+    async def _refresh_near_duplicates(self, session):
+        now = time.monotonic()
+        if now - self.near_duplicates_loaded_at < self.near_duplicates_refresh_interval:
+            return
+        self.near_duplicates_loaded_at = now
+        rows = (await session.execute(select(Vacancy.id, Vacancy.simhash).filter(
+            Vacancy.id > self.near_duplicates_last_id
+        ).order_by(Vacancy.id))).all()
+        for vacancy_id, value in rows:
+            self.near_duplicates.add(vacancy_id, value)
+        if rows:
+            self.near_duplicates_last_id = rows[-1][0]
+
+    @timed('validate_vacancy')
+    async def _validate_vacancy(self, parsed, session):
+        await self._refresh_matcher(session)
+        return self.matcher.match(parsed.normalized)
+
+    async def _refresh_matcher(self, session):
+        now = time.monotonic()
+        if self.filters_loaded_at is not None and now - self.filters_loaded_at < self.filters_reload_interval:
+            return
+        self.filters_loaded_at = now
+        filters = (await session.scalars(select(Filter).filter(Filter.is_active == True))).all()
+        if FilterMatcher.make_signature(filters) != self.matcher.signature:
+            self.matcher.build(filters)
+            logger.info(f"Filter matcher rebuilt with {len(filters)} filters")
+
+    @timed('relevance')
+    async def _score_relevance(self, parsed, session):
+        if not self.relevance_weight or not self.resume_terms:
+            return [None] * len(parsed)
+        await self._refresh_relevance(session)
+        similarity = self.relevance.similarity([extract_terms(item.tokens) for item in parsed], self.resume_terms)
+        return [float(value) for value in similarity]
+
+    async def _refresh_relevance(self, session, force=False):
+        now = time.monotonic()
+        if not force and self.relevance_loaded_at is not None and (
+            now - self.relevance_loaded_at < self.relevance_refresh_interval
+        ):
+            return
+        self.relevance_loaded_at = now
+        rows = await session.stream(select(Vacancy.id, Vacancy.text).filter(
+            Vacancy.id > self.relevance.last_vacancy_id,
+            Vacancy.archived_at == None
+        ).order_by(Vacancy.id).execution_options(yield_per=1000))
+        fitted = 0
+        async for partition in rows.partitions():
+            self.relevance.partial_fit([extract_terms(normalize_content(text).split()) for _, text in partition])
+            self.relevance.last_vacancy_id = partition[-1][0]
+            fitted += len(partition)
+        if fitted:
+            logger.info(f"Relevance model fitted on {fitted} new vacancies ({len(self.relevance.vocabulary)} terms)")
+
+    async def _load_relevance_model(self):
+        async with async_session_scope() as session:
+            row = await session.get(RelevanceModel, 1)
+            if row:
+                self.relevance = TfidfModel.loads(row.data, row.n_docs, row.last_vacancy_id)
+            await self._refresh_relevance(session, force=True)
+        await self._save_relevance_model()
+
+    async def _save_relevance_model(self):
+        model = self.relevance
+        async with async_session_scope() as session:
+            values = dict(
+                n_docs=model.n_docs,
+                last_vacancy_id=model.last_vacancy_id,
+                data=model.dumps(),
+                updated_at=datetime.now(),
+            )
+            stmt = self._insert(session, RelevanceModel).values(id=1, **values)
+            await session.execute(stmt.on_conflict_do_update(
+                index_elements=['id'], set_=values, where=RelevanceModel.last_vacancy_id < model.last_vacancy_id
+            ))
+            await session.commit()
+
+    def _load_resume_terms(self, path):
+        try:
+            return extract_terms(normalize_content(extract_pdf_text(path)).split())
+        except Exception as e:
+            logger.warning(f"Failed to read resume text from {path}: {e}")
+            return []
+
+    @timed('save_vacancy')
+    async def _save_vacancy(self, parsed, chat_id, score, hr, session, filter_ids=(), relevance=None):
         vacancy = Vacancy(
-            title=title,
-            text=text,
+            title=parsed.title,
+            text=parsed.raw,
             score=score,
+            relevance=relevance,
+            combined_score=combine_score(score, relevance, self.relevance_weight, self.relevance_cutoff),
+            content_hash=parsed.content_hash,
+            simhash=parsed.simhash,
             chat_id=chat_id,
-            hr_id=hr.id if hr else None
+            hr=hr
         )
         session.add(vacancy)
-        session.commit()
+        await session.flush()
+        session.add_all(VacancyFilter(vacancy_id=vacancy.id, filter_id=filter_id) for filter_id in filter_ids)
+        await session.commit()
         return vacancy
 
-    async def _get_hr(self, text, session):
-        hr_username = await self._get_hr_username(text)
-        if not hr_username:
-            return None
-        hr = session.query(HR).filter(HR.username == hr_username).first()
+    async def _refresh_ignored_contacts(self, session):
+        now = time.monotonic()
+        if self.ignored_contacts_loaded_at is not None and now - self.ignored_contacts_loaded_at < self.ignore_list_reload_interval:
+            return
+        self.ignored_contacts_loaded_at = now
+        values = await session.scalars(select(IgnoredContact.value))
+        self.ignored_contacts = frozenset(value.lower() for value in values)
+
+    @timed('get_hr')
+    async def _get_hr(self, parsed, session):
+        await self._refresh_ignored_contacts(session)
+        for hr_username in pick_usernames(parsed.contacts, self.ignored_contacts)[:self.hr_candidates]:
+            hr = await self._resolve_hr(hr_username, session)
+            if hr:
+                return hr
+        return None
+
+    async def _resolve_hr(self, hr_username, session):
+        hr = await session.scalar(select(HR).filter(func.lower(HR.username) == hr_username).limit(1))
         if hr:
+            self.hr_index.add_hr(hr.telegram_id)
             return hr
         try:
-            user = await self.client.get_users(hr_username)
+            user = await self.peers.resolve(hr_username)
             if not user:
-                logger.warning(f"User @{hr_username} not found")
+                logger.warning("User @%s not found", hr_username)
                 return None
-            hr = session.query(HR).filter(HR.telegram_id == user.id).first()
+            hr = await session.scalar(select(HR).filter(HR.telegram_id == user.id).limit(1))
             if hr:
                 if not hr.username or hr.username != user.username:
                     hr.username = user.username
-                    session.commit()
+                    await session.commit()
+                self.hr_index.add_hr(hr.telegram_id)
                 return hr
             hr = HR(
                 telegram_id=user.id,
@@ -330,84 +657,343 @@ class JobBot:
                 last_name=user.last_name
             )
             session.add(hr)
-            session.commit()
+            await session.commit()
+            self.hr_index.add_hr(hr.telegram_id)
             return hr
         except Exception as e:
-            logger.warning(f"Failed to get user info for @{hr_username}: {e}")
+            logger.warning("Failed to get user info for @%s: %s", hr_username, e)
             return
     
-    async def _get_hr_username(self, text):
-        matches = re.findall(r'@([a-zA-Z0-9_]{5,32})', text)
-        for username in matches:
-            if username.lower() not in [u.lower() for u in USERNAME_IGNORE_LIST]:
-                return username
-        return None
-    
-    async def _apply_vacancy(self, vacancy):
-        logger.info(f"Applying vacancy: {vacancy.id} - {vacancy.title}")
+    async def _recover_outbox(self, orphaned_only=False):
+        async with async_session_scope() as session:
+            query = update(Outbox).filter(Outbox.status == 'sending')
+            if orphaned_only:
+                query = query.filter(Outbox.claimed_by.not_in(self.shard.live_workers))
+            elif self.sharding:
+                query = query.filter(or_(
+                    Outbox.claimed_by == None,
+                    Outbox.claimed_by == self.shard.worker_name,
+                    Outbox.claimed_by.not_in(self.shard.live_workers)
+                ))
+            await session.execute(query.values(status='pending', claimed_by=None, claimed_at=None))
+
+    async def _claim_outbox(self):
+        async with async_session_scope() as session:
+            query = select(Outbox).filter(
+                Outbox.status == 'pending',
+                Outbox.next_attempt_at <= datetime.now()
+            )
+            if self.sharding:
+                query = query.join(Vacancy, Outbox.vacancy_id == Vacancy.id).outerjoin(
+                    HR, Vacancy.hr_id == HR.id
+                ).filter(or_(
+                    HR.account == None,
+                    HR.account == self.shard.worker_name,
+                    HR.account.not_in(self.shard.live_workers)
+                ))
+            item = await session.scalar(query.order_by(Outbox.next_attempt_at, Outbox.id).limit(1).with_for_update(
+                skip_locked=True, of=Outbox
+            ))
+            if not item:
+                return None
+            item.status = 'sending'
+            item.claimed_by = self.shard.worker_name
+            item.claimed_at = datetime.now()
+            return item.id
+
+    async def _run_sender(self):
+        while True:
+            try:
+                item_id = await self._claim_outbox()
+                if item_id is None:
+                    await asyncio.sleep(self.outbox_poll_interval)
+                    continue
+                await self._send_outbox(item_id)
+            except Exception as e:
+                logger.error(f"Error in outbox sender: {e}", exc_info=True)
+                await asyncio.sleep(self.outbox_poll_interval)
+
+    async def _send_outbox(self, item_id):
+        async with async_session_scope() as session:
+            item = await session.get(Outbox, item_id, options=[
+                selectinload(Outbox.vacancy).selectinload(Vacancy.hr)
+            ])
+            with log_fields(vacancy_id=item.vacancy_id):
+                try:
+                    if item.vacancy.hr_id:
+                        if self.sharding and item.vacancy.hr.account != self.shard.worker_name:
+                            logger.info("HR %s assigned to account %s", item.vacancy.hr.telegram_id, self.shard.worker_name)
+                            item.vacancy.hr.account = self.shard.worker_name
+                        await session.commit()
+                        await self._wait_send_slot()
+                    sent = await self._apply_vacancy(item.vacancy, session)
+                except Exception as e:
+                    item.attempts += 1
+                    item.last_error = str(e)
+                    if isinstance(e, FloodWait):
+                        delay = e.value
+                        FLOOD_WAIT.labels('apply_vacancy').inc(e.value)
+                        self.next_send_at = max(self.next_send_at, time.monotonic() + e.value)
+                    else:
+                        delay = min(self.retry_base_delay * 2 ** (item.attempts - 1), self.retry_max_delay)
+                    if item.attempts >= self.max_send_attempts:
+                        item.status = 'failed'
+                        logger.error("Giving up on vacancy after %s attempts: %s", item.attempts, e)
+                    else:
+                        item.status = 'pending'
+                        item.next_attempt_at = datetime.now() + timedelta(seconds=delay)
+                        logger.warning("Failed to apply vacancy, retrying in %ss: %s", delay, e)
+                    return
+                # Delivery is at-least-once: a crash before this commit leaves the row 'sending' and it is sent again
+                item.status = 'sent'
+                item.sent_at = datetime.now()
+                item.sent_message_id = sent.id if sent else None
+                await session.commit()
+                if item.vacancy.hr:
+                    self.hr_index.add_vacancy(item.vacancy.hr.telegram_id, item.vacancy_id, item.sent_message_id)
+
+    async def _wait_send_slot(self):
+        now = time.monotonic()
+        slot = max(now, self.next_send_at)
+        delay = self.send_delay * random.uniform(1 - self.send_jitter, 1 + self.send_jitter)
+        self.next_send_at = slot + delay
+        await asyncio.sleep(slot - now)
+
+    @timed('apply_vacancy')
+    async def _apply_vacancy(self, vacancy, session):
+        logger.info("Applying vacancy: %s", vacancy.title)
         if not vacancy.hr:
             if not os.getenv("NOTIFY_HOST"):
                 notification = f"**Интересная вакансия без контакта HR**"
                 notification += f"\n**Вакансия:** {vacancy.title} ({vacancy.score} баллов)"
+                contacts = [
+                    f"@{contact.value}" if contact.kind == 'username' else contact.value
+                    for contact in extract_contacts(vacancy.text)
+                    if contact.value not in self.ignored_contacts
+                ]
+                if contacts:
+                    notification += f"\n**Контакты:** {', '.join(contacts)}"
                 notification += f"\n```\n{vacancy.text}\n```"
                 await self._notify_host(notification)
-            self._update_statistics(applied_to_host=1)
-            logger.info(f"Notified host about vacancy: {vacancy.id} - {vacancy.title}")
+            self._update_statistics(vacancy.chat_id, applied_to_host=1)
+            logger.info("Notified host about vacancy: %s", vacancy.title)
         else:
-            with session_scope() as session:
-                answers = session.query(Answer).filter(Answer.is_active == True).all()
-                if not answers:
-                    logger.warning("No active answers found")
-                    return
-                answer = random.choice(answers)
-                message_text = self._format_answer(answer, vacancy)
-                await asyncio.sleep(self.send_delay)
-                resume_path = self._get_resume_path()
-                await self._notify_hr(vacancy.hr.telegram_id, message_text, resume_path)
-                self._update_statistics(applied_to_hr=1)
-                logger.info(f"Notified HR @{vacancy.hr.username} about vacancy: {vacancy.id} - {vacancy.title}")
+            answers = (await session.scalars(select(Answer).filter(Answer.is_active == True))).all()
+            if not answers:
+                raise RuntimeError("No active answers found")
+            answer = random.choice(answers)
+            message_text = self._format_answer(answer, vacancy)
+            sent = await self._notify_hr(
+                vacancy.hr.telegram_id, message_text, attach_resume=True, username=vacancy.hr.username
+            )
+            self._update_statistics(vacancy.chat_id, applied_to_hr=1)
+            logger.info("Notified HR @%s about vacancy: %s", vacancy.hr.username, vacancy.title)
+            return sent
 
     def _format_answer(self, answer, vacancy):
         message_text = answer.text.replace("{vacancy_title}", vacancy.title)
         return message_text
 
-    async def _notify_hr(self, hr_id, text, document=None):
-        user = await self.client.get_users(hr_id)
-        if document:
-            await self.client.send_document(user.id, document, caption=text)
-        else:
-            await self.client.send_message(user.id, text)
+    @timed('notify_hr')
+    async def _notify_hr(self, hr_id, text, attach_resume=False, username=None):
+        user = await self.peers.resolve(hr_id)
+        if not user and username:
+            user = await self.peers.resolve(username)
+        if not user:
+            raise LookupError(f"HR {hr_id} not found")
+        try:
+            if attach_resume and self.resume.path:
+                return await self._send_resume(user.id, text)
+            return await self.client.send_message(user.id, text)
+        except NOT_FOUND_ERRORS:
+            self.peers.invalidate(user.id)
+            if user.username:
+                self.peers.invalidate(user.username)
+            raise
+
+    async def _send_resume(self, user_id, text):
+        if not self.resume.file_id:
+            async with self.resume_lock:
+                if not self.resume.file_id:
+                    return await self._upload_resume(user_id, text)
+        try:
+            return await self.client.send_document(user_id, self.resume.file_id, caption=text)
+        except STALE_FILE_ID_ERRORS as e:
+            logger.warning(f"Cached resume file_id rejected, uploading again: {e}")
+            self.resume.file_id = None
+        async with self.resume_lock:
+            return await self._upload_resume(user_id, text)
+
+    @timed('upload_resume')
+    async def _upload_resume(self, user_id, text):
+        resume = self.resume
+        path, mtime, size, sha256 = resume.path, resume.mtime, resume.size, resume.sha256
+        message = await self.client.send_document(user_id, path, caption=text)
+        if not (message and message.document) or sha256 != resume.sha256:
+            return message
+        resume.file_id = message.document.file_id
+        try:
+            async with async_session_scope() as session:
+                values = dict(path=path, mtime=mtime, size=size, file_id=resume.file_id, uploaded_at=datetime.now())
+                stmt = self._insert(session, ResumeUpload).values(sha256=sha256, **values)
+                await session.execute(stmt.on_conflict_do_update(index_elements=['sha256'], set_=values))
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Resume {path} uploaded, but caching its file_id failed: {e}")
+            return message
+        logger.info(f"Resume {path} uploaded, file_id cached")
+        return message
 
+    @timed('notify_host')
     async def _notify_host(self, text):
-        user = await self.client.get_users(self.host_username)
+        user = await self.peers.resolve(self.host_username)
+        if not user:
+            logger.warning(f"Host @{self.host_username} not found")
+            return
         await self.client.send_message(user.id, text, parse_mode=ParseMode.MARKDOWN)
     
-    def _get_resume_path(self):
-        files_dir = Path("files")
-        if not files_dir.exists():
-            logger.warning("Files directory not found")
-            return None
-        resume_files = list(files_dir.glob("*.pdf"))
-        if not resume_files:
-            logger.warning("No PDF resume found in files directory")
-            return None
-        return str(resume_files[0])
-    
-    def _update_statistics(self, applied_to_hr=0, applied_to_host=0, replied_vacancies=0):
-        with session_scope() as session:
-            statistic = session.query(Statistic).filter(
-                Statistic.id == self.statistics_id
-            ).first()
-            if statistic:
-                statistic.applied_to_hr += applied_to_hr
-                statistic.applied_to_host += applied_to_host
-                statistic.replied_vacancies += replied_vacancies
-                statistic.updated_at = datetime.now()
-                session.commit()
+    async def _refresh_resume(self):
+        if not await asyncio.to_thread(self.resume.refresh):
+            return
+        if not self.resume.path:
+            self.resume_terms = []
+            logger.warning("Resume removed, applications will be sent without it")
+            return
+        if self.relevance_weight:
+            self.resume_terms = await asyncio.to_thread(self._load_resume_terms, self.resume.path)
+        async with async_session_scope() as session:
+            self.resume.file_id = await session.scalar(select(ResumeUpload.file_id).filter(
+                ResumeUpload.sha256 == self.resume.sha256
+            ))
+        state = "cached file_id" if self.resume.file_id else "upload pending"
+        logger.info(f"Resume {self.resume.path} loaded ({state})")
+
+    async def _run_shard_heartbeat(self):
+        while True:
+            await asyncio.sleep(self.shard.lease_ttl / 3)
+            try:
+                async with async_session_scope() as session:
+                    await self.shard.rebalance(session, self.dialog_chat_ids)
+                await self._recover_outbox(orphaned_only=True)
+            except Exception as e:
+                logger.error(f"Error renewing chat leases: {e}", exc_info=True)
+
+    async def _run_retention(self):
+        while True:
+            await asyncio.sleep(self.retention_interval)
+            if self.sharding and self.shard.worker_name != min(self.shard.live_workers):
+                continue
+            try:
+                await asyncio.to_thread(run_retention, self.message_retention_days, self.vacancy_retention_days)
+            except Exception as e:
+                logger.error(f"Error running retention: {e}", exc_info=True)
+
+    async def _run_resume_watcher(self):
+        while True:
+            await asyncio.sleep(self.resume_check_interval)
+            try:
+                await self._refresh_resume()
+            except Exception as e:
+                logger.error(f"Error refreshing resume: {e}", exc_info=True)
+
+    def _update_statistics(self, chat_id, **counts):
+        self.stats.add(chat_id, **counts)
+
+    async def _flush_statistics(self):
+        buckets = self.stats.drain()
+        if not buckets:
+            return
+        try:
+            async with async_session_scope() as session:
+                stmt = self._insert(session, StatisticHourly).values([
+                    {'hour': hour, 'chat_id': chat_id, **{name: counts[name] for name in STAT_COUNTERS}}
+                    for (hour, chat_id), counts in buckets.items()
+                ])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=['hour', 'chat_id'],
+                    set_={name: getattr(StatisticHourly, name) + getattr(stmt.excluded, name) for name in STAT_COUNTERS}
+                )
+                await session.execute(stmt)
+                totals = Counter()
+                for counts in buckets.values():
+                    totals.update(counts)
+                await session.execute(update(Statistic).filter(Statistic.id == self.statistics_id).values(
+                    applied_to_hr=Statistic.applied_to_hr + totals['applied_to_hr'],
+                    applied_to_host=Statistic.applied_to_host + totals['applied_to_host'],
+                    replied_vacancies=Statistic.replied_vacancies + totals['replied_vacancies'],
+                    updated_at=datetime.now()
+                ))
+        except Exception:
+            self.stats.restore(buckets)
+            raise
+
+    async def _update_outbox_depth(self):
+        async with async_session_scope() as session:
+            pending = await session.scalar(select(func.count(Outbox.id)).filter(Outbox.status == 'pending'))
+        QUEUE_DEPTH.labels('outbox').set(pending)
+
+    async def _refresh_rollups(self):
+        async with async_session_scope() as session:
+            if await refresh_rollups(session):
+                logger.info("Statistics rollups refreshed")
+
+    async def _run_statistics_flusher(self):
+        rollups_refreshed_at = time.monotonic()
+        while True:
+            await asyncio.sleep(self.stats_flush_interval)
+            try:
+                await self._flush_statistics()
+                await self._update_outbox_depth()
+                if time.monotonic() - rollups_refreshed_at >= self.stats_rollup_interval:
+                    rollups_refreshed_at = time.monotonic()
+                    await self._refresh_rollups()
+            except Exception as e:
+                logger.error(f"Error flushing statistics: {e}", exc_info=True)
 
     async def start(self):
+        self.statistics_id = await self._setup_statistics()
+        await self._warm_caches()
+        await asyncio.to_thread(self.exporter.load)
+        await self._refresh_resume()
+        if self.relevance_weight:
+            await self._load_relevance_model()
+        if not self.resume.path:
+            logger.warning("No PDF resume found, applications will be sent without it")
+        if self.ingest_mode == "push":
+            await self._refresh_active_chats()
+        self.offload.start()
         await self.client.start()
+        if self.sharding:
+            async with async_session_scope() as session:
+                await self.shard.heartbeat(session)
+        await self._recover_outbox()
         asyncio.create_task(self._poll_channels())
+        for _ in range(self.sender_count):
+            asyncio.create_task(self._run_sender())
+        asyncio.create_task(self._run_statistics_flusher())
+        asyncio.create_task(self._run_markdown_writer())
+        asyncio.create_task(self._run_resume_watcher())
+        if self.sharding:
+            asyncio.create_task(self._run_shard_heartbeat())
+        if self.retention_interval:
+            asyncio.create_task(self._run_retention())
 
     async def stop(self):
+        await self.markdown_queue.join()
+        try:
+            await self._flush_statistics()
+        except Exception as e:
+            logger.error(f"Error flushing statistics: {e}", exc_info=True)
+        if self.relevance_weight:
+            try:
+                await self._save_relevance_model()
+            except Exception as e:
+                logger.error(f"Error saving relevance model: {e}", exc_info=True)
+        if self.sharding:
+            try:
+                async with async_session_scope() as session:
+                    await self.shard.release(session)
+            except Exception as e:
+                logger.error(f"Error releasing chat leases: {e}", exc_info=True)
+        self.offload.shutdown()
         await self.client.stop()
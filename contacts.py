@@ -0,0 +1,82 @@
+import re
+from collections import namedtuple
+
+
+CONTACT_PATTERN = re.compile(
+    r't(?:\.me/|elegram\.me/|g://resolve\?domain=)(?P<link>[a-z0-9_]{5,32})(?![a-z0-9_/])'
+    r'|@(?P<at>[a-z0-9_.\-]+)'
+    r'|\+\d{1,3}(?P<phone>[\s\-]?\(?\d{3}\)?[\s\-]?\d{3}[\s\-]?\d{2}[\s\-]?\d{2})(?!\d)'
+    r'|8(?P<local_phone>[\s\-]?\(?\d{3}\)?[\s\-]?\d{3}[\s\-]?\d{2}[\s\-]?\d{2})(?!\d)'
+)
+USERNAME_PATTERN = re.compile(r'[a-z0-9_]{5,32}(?![a-z0-9_])')
+EMAIL_LOCAL_PATTERN = re.compile(r'[a-z0-9._%+\-]{1,64}$')
+EMAIL_DOMAIN_PATTERN = re.compile(r'[a-z0-9\-]+(?:\.[a-z0-9\-]+)*\.[a-z]{2,}')
+CUE_PATTERN = re.compile(
+    r'\b(?:hr|cv|recruit|рекрутер|контакт|связ|пиш|писать|напис|резюме|отклик|телеф|тел|phone|telegram|тг)'
+)
+NON_DIGITS = re.compile(r'\D')
+
+KIND_SCORES = {'link': 3, 'mention': 3, 'email': 1, 'phone': 1}
+UNCUED_LINK_SCORE = 0
+CUE_DISTANCE = 80
+LINK_CUE_DISTANCE = 24
+CUE_BONUS = 2
+BOT_PENALTY = 3
+
+Contact = namedtuple('Contact', ['kind', 'value', 'score'])
+
+
+def _classify(lowered, match):
+    kind = match.lastgroup
+    start = match.start()
+    if start and (lowered[start - 1].isalnum() or lowered[start - 1] == '_') and kind != 'at':
+        return None, None
+    if kind == 'link':
+        return 'link', match.group('link')
+    if kind == 'at':
+        local = EMAIL_LOCAL_PATTERN.search(lowered, max(start - 64, 0), start) if start else None
+        if local:
+            domain = EMAIL_DOMAIN_PATTERN.match(match.group('at'))
+            if domain:
+                return 'email', f"{local.group()}@{domain.group()}"
+        username = USERNAME_PATTERN.match(match.group('at'))
+        return ('mention', username.group()) if username else (None, None)
+    digits = NON_DIGITS.sub('', match.group())
+    if kind == 'local_phone':
+        digits = '7' + digits[1:]
+    return 'phone', '+' + digits
+
+
+def extract_lowered_contacts(lowered):
+    found = {}
+    for match in CONTACT_PATTERN.finditer(lowered):
+        kind, value = _classify(lowered, match)
+        if not kind:
+            continue
+        score = KIND_SCORES[kind]
+        if kind == 'link' and not CUE_PATTERN.search(lowered, max(match.start() - LINK_CUE_DISTANCE, 0), match.start()):
+            score = UNCUED_LINK_SCORE
+        if CUE_PATTERN.search(lowered, max(match.start() - CUE_DISTANCE, 0), match.start()):
+            score += CUE_BONUS
+        if kind in ('link', 'mention'):
+            kind = 'username'
+            if value.endswith('bot'):
+                score -= BOT_PENALTY
+        key = (kind, value)
+        if key not in found:
+            found[key] = (Contact(kind, value, score), len(found))
+        elif found[key][0].score < score:
+            found[key] = (Contact(kind, value, score), found[key][1])
+    ranked = sorted(found.values(), key=lambda item: (-item[0].score, item[1]))
+    return [contact for contact, _ in ranked]
+
+
+def extract_contacts(text):
+    return extract_lowered_contacts((text or '').lower())
+
+
+def pick_usernames(contacts, ignored=frozenset()):
+    return [
+        contact.value for contact in contacts
+        if contact.kind == 'username' and not contact.value.endswith('bot') and contact.value not in ignored
+    ]
@@ -0,0 +1,86 @@
+import re
+import hashlib
+from collections import defaultdict
+
+
+HASHTAG_PATTERN = re.compile(r'(?<!\w)#\w+')
+NON_WORD_PATTERN = re.compile(r'[^\w]+')
+
+SIMHASH_BITS = 64
+SIMHASH_MIN_TOKENS = 8
+
+
+def normalize_lowered_content(lowered):
+    return NON_WORD_PATTERN.sub(' ', HASHTAG_PATTERN.sub(' ', lowered)).strip()
+
+
+def normalize_content(text):
+    return normalize_lowered_content((text or '').lower())
+
+
+def content_hash(normalized):
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def _feature_hash(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(tokens):
+    if len(tokens) < SIMHASH_MIN_TOKENS:
+        return None
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    vector = [0] * SIMHASH_BITS
+    for feature in features:
+        h = _feature_hash(feature)
+        for bit in range(SIMHASH_BITS):
+            vector[bit] += 1 if h >> bit & 1 else -1
+    value = 0
+    for bit in range(SIMHASH_BITS):
+        if vector[bit] > 0:
+            value |= 1 << bit
+    return to_signed(value)
+
+
+def to_signed(value):
+    return value - (1 << SIMHASH_BITS) if value >= 1 << (SIMHASH_BITS - 1) else value
+
+
+def to_unsigned(value):
+    return value + (1 << SIMHASH_BITS) if value < 0 else value
+
+
+def fingerprint(text):
+    normalized = normalize_content(text)
+    return content_hash(normalized), simhash(normalized.split())
+
+
+class SimHashIndex:
+    def __init__(self, max_distance=3):
+        self.max_distance = max_distance
+        self.bands = max_distance + 1
+        self.band_bits = SIMHASH_BITS // self.bands
+        self.band_mask = (1 << self.band_bits) - 1
+        self.buckets = [defaultdict(list) for _ in range(self.bands)]
+        self.ids = set()
+
+    def _band_keys(self, value):
+        value = to_unsigned(value)
+        return [value >> (i * self.band_bits) & self.band_mask for i in range(self.bands)]
+
+    def add(self, vacancy_id, value):
+        if value is None or vacancy_id in self.ids:
+            return
+        self.ids.add(vacancy_id)
+        for bucket, key in zip(self.buckets, self._band_keys(value)):
+            bucket[key].append((vacancy_id, value))
+
+    def find(self, value):
+        if value is None:
+            return None
+        unsigned = to_unsigned(value)
+        for bucket, key in zip(self.buckets, self._band_keys(value)):
+            for vacancy_id, candidate in bucket.get(key, ()):
+                if bin(unsigned ^ to_unsigned(candidate)).count('1') <= self.max_distance:
+                    return vacancy_id
+        return None
@@ -0,0 +1,179 @@
+import os
+import re
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from sqlalchemy import select, update
+from config import get_logger, session_scope
+from logging_setup import setup_logging
+from models import Vacancy, HR
+from text_utils import remove_emojis, sanitize_filename, truncate_to_word
+
+logger = get_logger(__name__)
+
+STATUS_PATTERN = re.compile(r'^status: (.*)$', re.MULTILINE)
+
+
+def get_files_dir():
+    custom_path = os.getenv("VACANCY_FILE_PATH")
+    return Path(custom_path) if custom_path else Path('files')
+
+
+def render_markdown(title, text, score, contact, status, created):
+    body = text.strip()
+    desc_source = next((p for p in body.split('\n\n') if p.strip()), body)
+    desc_source_clean = remove_emojis(desc_source)
+    desc_flat = desc_source_clean.replace('\n', ' ').strip()
+    desc = truncate_to_word(desc_flat, 100).strip()
+    if desc:
+        desc = desc[0].upper() + desc[1:].lower()
+        if not desc.endswith('.'):
+            desc += "."
+    return (
+        "---\n"
+        "tags:\n"
+        "  - Vacancy\n"
+        f"desc: {desc}\n"
+        f"score: {score}\n"
+        f"contact: {contact}\n"
+        f"status: {status}\n"
+        f"created: {created.isoformat()}\n"
+        "links:\n"
+        "  - \"[[Вакансии]]\"\n"
+        "---\n"
+        f"### {title}\n\n"
+        f"{body}"
+    )
+
+
+class MarkdownExporter:
+    def __init__(self, files_dir):
+        self.files_dir = Path(files_dir)
+        self.names = None
+        self.lock = threading.Lock()
+        self.claim_lock = threading.Lock()
+
+    def load(self):
+        self.files_dir.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            self.names = {path.name.casefold() for path in self.files_dir.iterdir()}
+        logger.info(f"Indexed {len(self.names)} files in {self.files_dir}")
+
+    def candidates(self, title):
+        base = sanitize_filename(title)
+        yield f"{base}.md"
+        counter = 1
+        while True:
+            yield f"{base} ({counter}).md"
+            counter += 1
+
+    def reserve(self, title):
+        if self.names is None:
+            self.load()
+        with self.lock:
+            for filename in self.candidates(title):
+                if filename.casefold() not in self.names:
+                    self.names.add(filename.casefold())
+                    return filename
+
+    def existing(self, title):
+        with self.lock:
+            names = set(self.names)
+        for filename in self.candidates(title):
+            if filename.casefold() not in names:
+                return
+            yield filename
+
+    def read(self, filename):
+        try:
+            return (self.files_dir / filename).read_text(encoding='utf-8')
+        except FileNotFoundError:
+            return None
+
+    def write(self, filename, content):
+        with open(self.files_dir / filename, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def find_legacy(self, title, text, claimed):
+        suffix = f"### {title}\n\n{text.strip()}"
+        for filename in self.existing(title):
+            if filename in claimed:
+                continue
+            existing = self.read(filename)
+            if existing is not None and existing.endswith(suffix):
+                return filename, existing
+        return None, None
+
+    def resync(self, row, claimed):
+        vacancy_id, title, text, score, hr_username, markdown_file, created_at = row
+        existing = self.read(markdown_file) if markdown_file else None
+        if existing is None:
+            with self.claim_lock:
+                markdown_file, existing = self.find_legacy(title, text, claimed)
+                if markdown_file:
+                    claimed.add(markdown_file)
+        if existing is None:
+            markdown_file = self.reserve(title)
+        match = STATUS_PATTERN.search(existing) if existing else None
+        status = match.group(1) if match else ('Applied' if hr_username else 'New')
+        contact = f"https://t.me/{hr_username}" if hr_username else ""
+        content = render_markdown(title, text, score, contact, status, created_at.date())
+        changed = content != existing
+        if changed:
+            self.write(markdown_file, content)
+        return vacancy_id, markdown_file, changed
+
+
+def _batches(batch_size):
+    last_id = 0
+    while True:
+        with session_scope() as session:
+            batch = [tuple(row) for row in session.execute(
+                select(
+                    Vacancy.id, Vacancy.title, Vacancy.text, Vacancy.score, HR.username, Vacancy.markdown_file,
+                    Vacancy.created_at
+                ).outerjoin(HR, Vacancy.hr_id == HR.id).filter(
+                    Vacancy.id > last_id, Vacancy.archived_at == None
+                ).order_by(Vacancy.id).limit(batch_size)
+            )]
+        if not batch:
+            return
+        last_id = batch[-1][0]
+        yield batch
+
+
+def resync(workers=8, batch_size=500):
+    exporter = MarkdownExporter(get_files_dir())
+    exporter.load()
+    claimed = set()
+    total = rewritten = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for rows in _batches(batch_size):
+            results = list(pool.map(lambda row: exporter.resync(row, claimed), rows))
+            paths = {row[0]: row[5] for row in rows}
+            moved = [
+                {'id': vacancy_id, 'markdown_file': markdown_file}
+                for vacancy_id, markdown_file, _ in results if paths[vacancy_id] != markdown_file
+            ]
+            if moved:
+                with session_scope() as session:
+                    session.execute(update(Vacancy), moved)
+            total += len(results)
+            rewritten += sum(1 for _, _, changed in results if changed)
+            logger.info(f"Resynced {total} vacancies, {rewritten} notes rewritten")
+    return total, rewritten
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate vacancy markdown notes")
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+    setup_logging()
+    total, rewritten = resync(args.workers, args.batch_size)
+    print(f"{total} vacancies checked, {rewritten} notes rewritten")
+
+
+if __name__ == "__main__":
+    main()
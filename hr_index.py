@@ -0,0 +1,35 @@
+class HRIndex:
+    def __init__(self):
+        self.vacancies = {}
+        self.threads = {}
+
+    def __contains__(self, telegram_id):
+        return telegram_id in self.vacancies
+
+    def __len__(self):
+        return len(self.vacancies)
+
+    def add_hr(self, telegram_id):
+        self.vacancies.setdefault(telegram_id, [])
+
+    def add_vacancy(self, telegram_id, vacancy_id, message_id=None):
+        vacancy_ids = self.vacancies.setdefault(telegram_id, [])
+        if vacancy_id in vacancy_ids:
+            vacancy_ids.remove(vacancy_id)
+        vacancy_ids.append(vacancy_id)
+        if message_id:
+            self.threads[(telegram_id, message_id)] = vacancy_id
+
+    def warm(self, telegram_ids, applications):
+        for telegram_id in telegram_ids:
+            self.add_hr(telegram_id)
+        for telegram_id, vacancy_id, message_id in applications:
+            self.add_vacancy(telegram_id, vacancy_id, message_id)
+
+    def resolve(self, telegram_id, reply_to_message_id=None):
+        if reply_to_message_id:
+            vacancy_id = self.threads.get((telegram_id, reply_to_message_id))
+            if vacancy_id:
+                return vacancy_id
+        vacancy_ids = self.vacancies.get(telegram_id)
+        return vacancy_ids[-1] if vacancy_ids else None
@@ -0,0 +1,109 @@
+import re
+from collections import deque
+
+
+IGNORED_PATTERNS = [
+    'ci/cd',
+    'c++',
+    'c#',
+]
+
+
+def _build_normalize_pattern(ignored):
+    protected = '|'.join(re.escape(p) for p in sorted(ignored, key=len, reverse=True))
+    if not protected:
+        return re.compile(r'[^\w]+')
+    return re.compile(rf'({protected})|(?:(?!{protected})[^\w])+')
+
+
+NORMALIZE_PATTERN = _build_normalize_pattern(IGNORED_PATTERNS)
+
+
+def _normalize_repl(match):
+    return match.group(1) or ' '
+
+
+def normalize_lowered(lowered):
+    return NORMALIZE_PATTERN.sub(_normalize_repl, lowered).strip()
+
+
+def normalize_text(text):
+    return normalize_lowered((text or '').lower())
+
+
+class MatchResult:
+    __slots__ = ('score', 'filter_ids')
+
+    def __init__(self, score=0, filter_ids=()):
+        self.score = score
+        self.filter_ids = frozenset(filter_ids)
+
+
+class FilterMatcher:
+    def __init__(self, filters=()):
+        self.weights = {}
+        self.always = set()
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+        self.signature = None
+        self.build(filters)
+
+    @staticmethod
+    def make_signature(filters):
+        return tuple(sorted((f.id, f.text, f.weight or 0) for f in filters))
+
+    def build(self, filters):
+        filters = list(filters)
+        self.signature = self.make_signature(filters)
+        self.weights = {f.id: f.weight or 0 for f in filters}
+        self.always = set()
+        goto = [{}]
+        outputs = [set()]
+        for f in filters:
+            for variant in (v.strip() for v in f.text.split(', ')):
+                if not variant:
+                    self.always.add(f.id)
+                    continue
+                node = 0
+                for ch in variant:
+                    nxt = goto[node].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[node][ch] = nxt
+                        goto.append({})
+                        outputs.append(set())
+                    node = nxt
+                outputs[node].add(f.id)
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                fail[nxt] = goto[state].get(ch, 0)
+                outputs[nxt] |= outputs[fail[nxt]]
+        self.goto = goto
+        self.fail = fail
+        self.output = [tuple(o) for o in outputs]
+
+    def match(self, normalized_text):
+        goto, fail, output = self.goto, self.fail, self.output
+        found = set(self.always)
+        total = len(self.weights)
+        node = 0
+        for ch in normalized_text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if output[node]:
+                found.update(output[node])
+                if len(found) == total:
+                    break
+        return MatchResult(sum(self.weights[i] for i in found), found)
+
+    def score(self, text):
+        return self.match(normalize_text(text))
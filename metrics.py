@@ -0,0 +1,61 @@
+import time
+import asyncio
+import functools
+from contextlib import contextmanager
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+from logging_setup import dropped_records
+
+
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+CYCLE_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1200)
+
+STAGE_LATENCY = Histogram(
+    'job_bot_stage_seconds', 'Latency of a pipeline stage', ['stage'], buckets=STAGE_BUCKETS
+)
+STAGE_ERRORS = Counter('job_bot_stage_errors_total', 'Exceptions raised by a pipeline stage', ['stage'])
+MESSAGES = Counter('job_bot_messages_total', 'Chat messages processed, by outcome', ['outcome'])
+CYCLE_DURATION = Histogram('job_bot_cycle_seconds', 'Duration of a channel check cycle', buckets=CYCLE_BUCKETS)
+CYCLE_CHATS = Gauge('job_bot_cycle_chats', 'Active chats checked in the last cycle')
+FLOOD_WAIT = Counter('job_bot_flood_wait_seconds_total', 'Seconds of FloodWait received', ['operation'])
+QUEUE_DEPTH = Gauge('job_bot_queue_depth', 'Items waiting in an internal queue', ['queue'])
+PEER_CACHE = Gauge('job_bot_peer_cache', 'Peer cache counters', ['kind'])
+LOG_RECORDS_DROPPED = Gauge('job_bot_log_records_dropped', 'Log records dropped because the log queue was full')
+LOG_RECORDS_DROPPED.set_function(dropped_records)
+
+
+@contextmanager
+def observe(stage):
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.labels(stage).inc()
+        raise
+    finally:
+        STAGE_LATENCY.labels(stage).observe(time.perf_counter() - started)
+
+
+def timed(stage):
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with observe(stage):
+                    return await func(*args, **kwargs)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with observe(stage):
+                    return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def track_peer_cache(peers):
+    PEER_CACHE.labels('hits').set_function(lambda: peers.hits)
+    PEER_CACHE.labels('misses').set_function(lambda: peers.misses)
+    PEER_CACHE.labels('size').set_function(lambda: len(peers.entries))
+
+
+def start_metrics_server(port, addr='127.0.0.1'):
+    start_http_server(port, addr=addr)
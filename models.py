@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, Text, Float, LargeBinary, ForeignKey, Index, DDL, event
 from sqlalchemy.orm import relationship
 from config import Base
 
@@ -30,17 +30,22 @@ class Chat(Base):
     telegram_id = Column(BigInteger, nullable=False)
     title = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True)
+    last_message_id = Column(BigInteger, nullable=True)
+    compacted_message_id = Column(BigInteger, nullable=True)
+    lease_owner = Column(String(64), nullable=True, index=True)
+    lease_expires_at = Column(DateTime, nullable=True)
 
 
 class HR(Base):
     __tablename__ = 'hrs'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    telegram_id = Column(BigInteger, nullable=False)
+    telegram_id = Column(BigInteger, nullable=False, index=True)
     username = Column(String(255), nullable=True)
     phone = Column(String(16), nullable=True)
     first_name = Column(String(255), nullable=True)
     last_name = Column(String(255), nullable=True)
+    account = Column(String(64), nullable=True)
     created_at = Column(DateTime, default=datetime.now)
 
 
@@ -53,12 +58,50 @@ class Vacancy(Base):
     hr_id = Column(Integer, ForeignKey('hrs.id'), nullable=True)
     chat_id = Column(Integer, ForeignKey('chats.id'), nullable=False)
     score = Column(Integer, default=0)
+    relevance = Column(Float, nullable=True)
+    combined_score = Column(Float, nullable=True)
+    content_hash = Column(String(64), nullable=True, unique=True, index=True)
+    simhash = Column(BigInteger, nullable=True)
+    markdown_file = Column(String(255), nullable=True)
     replied_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.now)
 
     hr = relationship('HR', backref='vacancies')
     chat = relationship('Chat', backref='vacancies')
 
+    __table_args__ = (
+        Index('ix_vacancies_created_at', 'created_at', postgresql_using='brin'),
+    )
+
+
+VACANCY_SEARCH_DDL = {
+    'postgresql': [
+        "ALTER TABLE vacancies ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('russian', coalesce(text, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(text, '')), 'B')) STORED",
+        "CREATE INDEX ix_vacancies_search_vector ON vacancies USING gin (search_vector)",
+    ],
+    'sqlite': [
+        "CREATE VIRTUAL TABLE vacancies_fts USING fts5("
+        "title, text, content='vacancies', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER vacancies_fts_ai AFTER INSERT ON vacancies BEGIN "
+        "INSERT INTO vacancies_fts(rowid, title, text) VALUES (new.id, new.title, new.text); END",
+        "CREATE TRIGGER vacancies_fts_ad AFTER DELETE ON vacancies BEGIN "
+        "INSERT INTO vacancies_fts(vacancies_fts, rowid, title, text) VALUES ('delete', old.id, old.title, old.text); END",
+        "CREATE TRIGGER vacancies_fts_au AFTER UPDATE OF title, text ON vacancies BEGIN "
+        "INSERT INTO vacancies_fts(vacancies_fts, rowid, title, text) VALUES ('delete', old.id, old.title, old.text); "
+        "INSERT INTO vacancies_fts(rowid, title, text) VALUES (new.id, new.title, new.text); END",
+    ],
+}
+
+for dialect, statements in VACANCY_SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(Vacancy.__table__, 'after_create', DDL(statement).execute_if(dialect=dialect))
+event.listen(Vacancy.__table__, 'before_drop', DDL("DROP TABLE IF EXISTS vacancies_fts").execute_if(dialect='sqlite'))
+
 
 class Message(Base):
     __tablename__ = 'messages'
@@ -70,6 +113,11 @@ class Message(Base):
 
     chat = relationship('Chat', backref='messages')
 
+    __table_args__ = (
+        Index('ix_messages_chat_id_telegram_id', 'chat_id', 'telegram_id', unique=True),
+        Index('ix_messages_created_at', 'created_at', postgresql_using='brin'),
+    )
+
 
 class Statistic(Base):
     __tablename__ = 'statistics'
@@ -80,3 +128,97 @@ class Statistic(Base):
     replied_vacancies = Column(Integer, default=0)
     updated_at = Column(DateTime, default=datetime.now)
     created_at = Column(DateTime, default=datetime.now)
+
+
+class StatisticHourly(Base):
+    __tablename__ = 'statistics_hourly'
+
+    hour = Column(DateTime, primary_key=True)
+    chat_id = Column(Integer, ForeignKey('chats.id'), primary_key=True)
+    messages_seen = Column(Integer, nullable=False, default=0)
+    vacancies_found = Column(Integer, nullable=False, default=0)
+    applied_to_hr = Column(Integer, nullable=False, default=0)
+    applied_to_host = Column(Integer, nullable=False, default=0)
+    replied_vacancies = Column(Integer, nullable=False, default=0)
+
+
+class IgnoredContact(Base):
+    __tablename__ = 'ignored_contacts'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    value = Column(String(255), nullable=False, unique=True)
+    created_at = Column(DateTime, default=datetime.now)
+
+
+DEFAULT_IGNORED_CONTACTS = ('best_itjob', 'it_rab', 'freeit_job')
+
+
+def _seed_ignored_contacts(target, connection, **kw):
+    connection.execute(target.insert(), [
+        {'value': value, 'created_at': datetime.now()} for value in DEFAULT_IGNORED_CONTACTS
+    ])
+
+
+event.listen(IgnoredContact.__table__, 'after_create', _seed_ignored_contacts)
+
+
+class VacancyFilter(Base):
+    __tablename__ = 'vacancy_filters'
+
+    vacancy_id = Column(Integer, ForeignKey('vacancies.id'), primary_key=True)
+    filter_id = Column(Integer, ForeignKey('filters.id'), primary_key=True, index=True)
+
+
+class Outbox(Base):
+    __tablename__ = 'outbox'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    vacancy_id = Column(Integer, ForeignKey('vacancies.id'), nullable=False, unique=True)
+    status = Column(String(16), nullable=False, default='pending', index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.now)
+    sent_at = Column(DateTime, nullable=True)
+    sent_message_id = Column(BigInteger, nullable=True)
+    claimed_by = Column(String(64), nullable=True)
+    claimed_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.now)
+
+    vacancy = relationship('Vacancy')
+
+
+class ResumeUpload(Base):
+    __tablename__ = 'resume_uploads'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    sha256 = Column(String(64), nullable=False, unique=True)
+    path = Column(String(1024), nullable=False)
+    mtime = Column(BigInteger, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    file_id = Column(String(255), nullable=False)
+    uploaded_at = Column(DateTime, default=datetime.now)
+
+
+class Worker(Base):
+    __tablename__ = 'workers'
+
+    name = Column(String(64), primary_key=True)
+    started_at = Column(DateTime, default=datetime.now)
+    heartbeat_at = Column(DateTime, nullable=False, default=datetime.now)
+
+
+class WorkerChat(Base):
+    __tablename__ = 'worker_chats'
+
+    worker = Column(String(64), primary_key=True)
+    chat_id = Column(Integer, ForeignKey('chats.id'), primary_key=True, index=True)
+
+
+class RelevanceModel(Base):
+    __tablename__ = 'relevance_models'
+
+    id = Column(Integer, primary_key=True)
+    n_docs = Column(Integer, nullable=False, default=0)
+    last_vacancy_id = Column(Integer, nullable=False, default=0)
+    data = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime, default=datetime.now)
@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from types import SimpleNamespace
+from config import get_logger
+from matcher import FilterMatcher
+from metrics import STAGE_LATENCY
+from parsing import ParsedMessage, render_entities
+
+logger = get_logger(__name__)
+
+MODES = ('off', 'process', 'thread', 'auto')
+
+_matcher = None
+
+
+def free_threaded():
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def _get_matcher(signature):
+    global _matcher
+    if _matcher is None or _matcher.signature != signature:
+        _matcher = FilterMatcher(SimpleNamespace(id=i, text=text, weight=weight) for i, text, weight in signature)
+    return _matcher
+
+
+def analyze_batch(contents, signature):
+    started = time.perf_counter()
+    matcher = _get_matcher(signature)
+    results = []
+    for text, entities in contents:
+        parsed = ParsedMessage(render_entities(text, entities))
+        parsed.compute_simhash()
+        results.append((parsed, matcher.match(parsed.normalized)))
+    return results, time.perf_counter() - started
+
+
+class TextOffload:
+    def __init__(self, mode='off', workers=None, min_batch=50):
+        if mode not in MODES:
+            raise ValueError(f"Unknown TEXT_OFFLOAD mode: {mode}")
+        if mode == 'auto':
+            mode = 'thread' if free_threaded() else 'process'
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self.min_batch = min_batch
+        self.executor = None
+
+    def start(self):
+        if self.mode == 'process':
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+            )
+        elif self.mode == 'thread':
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='text-offload')
+        if self.executor:
+            logger.info(f"Text offload: {self.mode} pool with {self.workers} workers, batches of {self.min_batch}+")
+
+    def accepts(self, size):
+        return self.executor is not None and size >= self.min_batch
+
+    async def analyze(self, contents, signature):
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        results, worker_time = await loop.run_in_executor(self.executor, analyze_batch, contents, signature)
+        elapsed = time.perf_counter() - started
+        STAGE_LATENCY.labels('offload_batch').observe(elapsed)
+        STAGE_LATENCY.labels('offload_worker').observe(worker_time)
+        logger.info(
+            "Offloaded %s messages to %s pool: %.1fms wall, %.1fms in worker",
+            len(contents), self.mode, elapsed * 1000, worker_time * 1000
+        )
+        return results
+
+    def shutdown(self):
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,55 @@
+import re
+from contacts import extract_lowered_contacts
+from dedup import content_hash, normalize_lowered_content, simhash
+from matcher import normalize_lowered
+from text_utils import remove_emojis
+
+
+TITLE_PATTERN = re.compile(r'[^0-9A-Za-zА-Яа-яЁё\+\-]+')
+
+
+def render_entities(text, entities):
+    if not entities:
+        return text
+    result = []
+    last_offset = 0
+    for offset, length, url in sorted(entities, key=lambda e: e[0]):
+        end = offset + length
+        result.append(text[last_offset:offset])
+        entity_text = text[offset:end]
+        result.append(f"[{entity_text}]({url})" if url else entity_text)
+        last_offset = end
+    result.append(text[last_offset:])
+    return "".join(result)
+
+
+def extract_title(text):
+    first_line = (text or '').split('\n', 1)[0][:255]
+    cleaned = TITLE_PATTERN.sub(' ', remove_emojis(first_line)).strip()
+    return cleaned.title() or 'Vacancy'
+
+
+class ParsedMessage:
+    __slots__ = ('raw', 'normalized', 'tokens', 'title', 'contacts', 'content_hash', '_simhash', '_simhash_ready')
+
+    def __init__(self, raw):
+        self.raw = raw or ''
+        lowered = self.raw.lower()
+        self.normalized = normalize_lowered(lowered)
+        content = normalize_lowered_content(lowered)
+        self.tokens = content.split()
+        self.title = extract_title(self.raw)
+        self.contacts = extract_lowered_contacts(lowered)
+        self.content_hash = content_hash(content)
+        self._simhash = None
+        self._simhash_ready = False
+
+    def compute_simhash(self):
+        if not self._simhash_ready:
+            self._simhash = simhash(self.tokens)
+            self._simhash_ready = True
+        return self._simhash
+
+    @property
+    def simhash(self):
+        return self.compute_simhash()
@@ -0,0 +1,98 @@
+import time
+import asyncio
+from collections import OrderedDict
+from pyrogram.errors import FloodWait, PeerIdInvalid, UsernameInvalid, UsernameNotOccupied
+from config import get_logger
+
+logger = get_logger(__name__)
+
+
+NOT_FOUND_ERRORS = (PeerIdInvalid, UsernameInvalid, UsernameNotOccupied)
+
+
+class Peer:
+    __slots__ = ('id', 'username', 'phone_number', 'first_name', 'last_name')
+
+    def __init__(self, id, username=None, phone_number=None, first_name=None, last_name=None):
+        self.id = id
+        self.username = username
+        self.phone_number = phone_number
+        self.first_name = first_name
+        self.last_name = last_name
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(user.id, user.username, user.phone_number, user.first_name, user.last_name)
+
+
+class PeerCache:
+    def __init__(self, client, maxsize=1024, negative_ttl=3600):
+        self.client = client
+        self.maxsize = maxsize
+        self.negative_ttl = negative_ttl
+        self.entries = OrderedDict()
+        self.pending = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(key):
+        if isinstance(key, str):
+            return key.lstrip('@').lower()
+        return key
+
+    def _store(self, key, value, expires_at=None):
+        self.entries[key] = (value, expires_at)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def put(self, peer):
+        self._store(peer.id, peer)
+        if peer.username:
+            self._store(self._key(peer.username), peer)
+
+    def invalidate(self, key):
+        self.entries.pop(self._key(key), None)
+
+    def warm(self, hrs):
+        for hr in hrs:
+            self.put(Peer(hr.telegram_id, hr.username, hr.phone, hr.first_name, hr.last_name))
+
+    async def resolve(self, key):
+        cache_key = self._key(key)
+        entry = self.entries.get(cache_key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self.entries.move_to_end(cache_key)
+                self.hits += 1
+                return value
+            del self.entries[cache_key]
+        task = self.pending.get(cache_key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._fetch(key, cache_key))
+            self.pending[cache_key] = task
+            task.add_done_callback(lambda _: self.pending.pop(cache_key, None))
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key, cache_key):
+        try:
+            user = await self.client.get_users(key)
+        except FloodWait:
+            raise
+        except NOT_FOUND_ERRORS:
+            user = None
+        except Exception as e:
+            logger.warning("Failed to resolve %s, caching as missing: %s", key, e)
+            user = None
+        if not user or isinstance(user, list):
+            self._store(cache_key, None, time.monotonic() + self.negative_ttl)
+            return None
+        peer = Peer.from_user(user)
+        self.put(peer)
+        return peer
+
+    def stats(self):
+        return {'size': len(self.entries), 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,91 @@
+import json
+import zlib
+from collections import Counter
+import numpy as np
+from scipy import sparse
+from pypdf import PdfReader
+
+
+MIN_TERM_LENGTH = 2
+
+
+def extract_terms(tokens):
+    return [token for token in tokens if len(token) >= MIN_TERM_LENGTH and not token.isdigit()]
+
+
+def combine_score(score, relevance, weight, cutoff):
+    if relevance is None or not weight:
+        return score
+    return score + weight * (relevance - cutoff)
+
+
+def extract_pdf_text(path):
+    reader = PdfReader(path)
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+class TfidfModel:
+    def __init__(self):
+        self.vocabulary = {}
+        self.df = np.zeros(0, dtype=np.int64)
+        self.n_docs = 0
+        self.last_vacancy_id = 0
+
+    def partial_fit(self, documents):
+        indices = []
+        for terms in documents:
+            for term in set(terms):
+                index = self.vocabulary.get(term)
+                if index is None:
+                    index = self.vocabulary[term] = len(self.vocabulary)
+                indices.append(index)
+        if len(self.vocabulary) > len(self.df):
+            self.df = np.concatenate([self.df, np.zeros(len(self.vocabulary) - len(self.df), dtype=np.int64)])
+        np.add.at(self.df, np.asarray(indices, dtype=np.int64), 1)
+        self.n_docs += len(documents)
+
+    def idf(self, unseen=0):
+        df = np.concatenate([self.df, np.zeros(unseen, dtype=np.int64)]) if unseen else self.df
+        return np.log((1 + self.n_docs) / (1 + df)) + 1
+
+    def transform(self, documents):
+        unseen = {}
+        rows, cols, counts = [], [], []
+        for row, terms in enumerate(documents):
+            indices = Counter()
+            for term in terms:
+                index = self.vocabulary.get(term)
+                if index is None:
+                    index = unseen.setdefault(term, len(self.vocabulary) + len(unseen))
+                indices[index] += 1
+            for index, count in indices.items():
+                rows.append(row)
+                cols.append(index)
+                counts.append(count)
+        tf = 1 + np.log(np.asarray(counts, dtype=np.float64))
+        size = len(self.vocabulary) + len(unseen)
+        matrix = sparse.csr_matrix((tf, (rows, cols)), shape=(len(documents), size))
+        matrix = sparse.csr_matrix(matrix.multiply(self.idf(len(unseen))))
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms) @ matrix
+
+    def similarity(self, documents, reference):
+        if not documents or not reference:
+            return np.zeros(len(documents))
+        matrix = self.transform(list(documents) + [reference])
+        return (matrix[:-1] @ matrix[-1].T).toarray().ravel()
+
+    def dumps(self):
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        return zlib.compress(json.dumps({'terms': terms, 'df': self.df.tolist()}, ensure_ascii=False).encode('utf-8'))
+
+    @classmethod
+    def loads(cls, data, n_docs, last_vacancy_id):
+        model = cls()
+        state = json.loads(zlib.decompress(data).decode('utf-8'))
+        model.vocabulary = {term: index for index, term in enumerate(state['terms'])}
+        model.df = np.asarray(state['df'], dtype=np.int64)
+        model.n_docs = n_docs
+        model.last_vacancy_id = last_vacancy_id
+        return model
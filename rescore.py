@@ -0,0 +1,123 @@
+import os
+import argparse
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from sqlalchemy import delete, insert, select, update
+from config import get_logger, session_scope
+from logging_setup import setup_logging
+from matcher import FilterMatcher
+from models import Filter, Vacancy, VacancyFilter
+from relevance import combine_score
+
+logger = get_logger(__name__)
+
+_matcher = None
+
+
+def _init_worker(filter_rows):
+    global _matcher
+    _matcher = FilterMatcher(SimpleNamespace(id=i, text=text, weight=weight) for i, text, weight in filter_rows)
+
+
+def _score_batch(rows):
+    results = []
+    for vacancy_id, text in rows:
+        result = _matcher.score(text)
+        results.append((vacancy_id, result.score, sorted(result.filter_ids)))
+    return results
+
+
+def _batches(batch_size):
+    last_id = 0
+    while True:
+        with session_scope() as session:
+            batch = [tuple(row) for row in session.execute(
+                select(Vacancy.id, Vacancy.text, Vacancy.score, Vacancy.relevance)
+                .filter(Vacancy.id > last_id, Vacancy.archived_at == None).order_by(Vacancy.id).limit(batch_size)
+            )]
+        if not batch:
+            return
+        last_id = batch[-1][0]
+        yield batch
+
+
+def _write_batch(results, relevance, relevance_weight, relevance_cutoff):
+    ids = [vacancy_id for vacancy_id, _, _ in results]
+    with session_scope() as session:
+        session.execute(update(Vacancy), [
+            {
+                'id': vacancy_id,
+                'score': score,
+                'combined_score': combine_score(score, relevance[vacancy_id], relevance_weight, relevance_cutoff),
+            }
+            for vacancy_id, score, _ in results
+        ])
+        session.execute(delete(VacancyFilter).filter(VacancyFilter.vacancy_id.in_(ids)))
+        links = [
+            {'vacancy_id': vacancy_id, 'filter_id': filter_id}
+            for vacancy_id, _, filter_ids in results for filter_id in filter_ids
+        ]
+        if links:
+            session.execute(insert(VacancyFilter), links)
+
+
+def rescore(workers=None, batch_size=2000, dry_run=False):
+    with session_scope() as session:
+        filter_rows = [
+            (f.id, f.text, f.weight) for f in session.query(Filter).filter(Filter.is_active == True)
+        ]
+    workers = workers or os.cpu_count() or 1
+    relevance_weight = float(os.getenv("RELEVANCE_WEIGHT", "0"))
+    relevance_cutoff = float(os.getenv("RELEVANCE_CUTOFF", "0.1"))
+    distribution = Counter()
+    total = changed = 0
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(filter_rows,)) as pool:
+        def drain(limit):
+            nonlocal total, changed
+            while len(pending) > limit:
+                old_scores, relevance, future = pending.popleft()
+                results = future.result()
+                for vacancy_id, score, _ in results:
+                    distribution[round(combine_score(score, relevance[vacancy_id], relevance_weight, relevance_cutoff))] += 1
+                    changed += old_scores[vacancy_id] != score
+                if not dry_run:
+                    _write_batch(results, relevance, relevance_weight, relevance_cutoff)
+                total += len(results)
+                logger.info(f"Rescored {total} vacancies")
+
+        for batch in _batches(batch_size):
+            old_scores = {vacancy_id: score for vacancy_id, _, score, _ in batch}
+            relevance = {vacancy_id: value for vacancy_id, _, _, value in batch}
+            rows = [(vacancy_id, text) for vacancy_id, text, _, _ in batch]
+            pending.append((old_scores, relevance, pool.submit(_score_batch, rows)))
+            drain(workers * 2)
+        drain(0)
+    return total, changed, distribution
+
+
+def print_report(total, changed, distribution, threshold):
+    print(f"{total} vacancies rescored, {changed} scores changed")
+    print(f"{'threshold':>10}{'passing':>10}{'share':>8}")
+    passing = total
+    for score in sorted(distribution):
+        marker = "  <- THRESHOLD" if score == threshold else ""
+        share = passing / total if total else 0
+        print(f"{score:>10}{passing:>10}{share:>8.1%}{marker}")
+        passing -= distribution[score]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score stored vacancies with the current filters")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--batch-size', type=int, default=2000)
+    parser.add_argument('--dry-run', action='store_true', help="only print the report, do not write scores")
+    args = parser.parse_args()
+    setup_logging()
+    total, changed, distribution = rescore(args.workers, args.batch_size, args.dry_run)
+    print_report(total, changed, distribution, int(os.getenv("THRESHOLD", "0")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import os
+import hashlib
+from pathlib import Path
+from pyrogram.errors import FileIdInvalid, FileReferenceExpired, FileReferenceInvalid, MediaEmpty
+from config import get_logger
+
+logger = get_logger(__name__)
+
+
+STALE_FILE_ID_ERRORS = (FileIdInvalid, FileReferenceExpired, FileReferenceInvalid, MediaEmpty)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_resume(files_dir):
+    resume_files = sorted(Path(files_dir).glob("*.pdf"))
+    return str(resume_files[0]) if resume_files else None
+
+
+class ResumeFile:
+    def __init__(self, path=None, files_dir="files"):
+        self.configured_path = path
+        self.files_dir = files_dir
+        self.path = None
+        self.mtime = None
+        self.size = None
+        self.sha256 = None
+        self.file_id = None
+
+    def refresh(self):
+        path = self.configured_path or find_resume(self.files_dir)
+        try:
+            stat = os.stat(path) if path else None
+        except OSError as e:
+            logger.warning(f"Resume {path} is not accessible: {e}")
+            stat = None
+        if stat is None:
+            changed = self.path is not None
+            self.path = self.mtime = self.size = self.sha256 = self.file_id = None
+            return changed
+        if path == self.path and stat.st_mtime_ns == self.mtime and stat.st_size == self.size:
+            return False
+        sha256 = file_sha256(path)
+        changed = sha256 != self.sha256
+        self.path, self.mtime, self.size = path, stat.st_mtime_ns, stat.st_size
+        if changed:
+            self.sha256 = sha256
+            self.file_id = None
+        return changed
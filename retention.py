@@ -0,0 +1,123 @@
+import os
+import gzip
+import json
+import argparse
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from sqlalchemy import delete, func, or_, select, update
+from config import get_logger, session_scope
+from logging_setup import setup_logging
+from models import Chat, Message, Outbox, Vacancy
+
+logger = get_logger(__name__)
+
+
+def get_archive_dir():
+    return Path(os.getenv("ARCHIVE_PATH", "archive"))
+
+
+def archive_path(archive_dir, created_at):
+    return Path(archive_dir) / f"vacancies-{created_at:%Y-%m}.jsonl.gz"
+
+
+def compact_messages(horizon_days):
+    cutoff = datetime.now() - timedelta(days=horizon_days)
+    deleted = 0
+    with session_scope() as session:
+        chats = session.execute(select(Chat.id, Chat.last_message_id).filter(Chat.last_message_id.isnot(None))).all()
+    for chat_id, last_message_id in chats:
+        with session_scope() as session:
+            watermark = session.scalar(select(func.max(Message.telegram_id)).filter(
+                Message.chat_id == chat_id,
+                Message.created_at < cutoff,
+                Message.telegram_id < last_message_id
+            ))
+            if watermark is None:
+                continue
+            result = session.execute(delete(Message).filter(
+                Message.chat_id == chat_id,
+                Message.telegram_id <= watermark
+            ))
+            session.execute(update(Chat).filter(
+                Chat.id == chat_id,
+                or_(Chat.compacted_message_id == None, Chat.compacted_message_id < watermark)
+            ).values(compacted_message_id=watermark))
+            deleted += result.rowcount
+    return deleted
+
+
+def archive_vacancies(horizon_days, archive_dir, batch_size=1000):
+    cutoff = datetime.now() - timedelta(days=horizon_days)
+    Path(archive_dir).mkdir(parents=True, exist_ok=True)
+    archived = 0
+    last_id = 0
+    while True:
+        with session_scope() as session:
+            rows = session.execute(select(
+                Vacancy.id, Vacancy.title, Vacancy.text, Vacancy.score, Vacancy.chat_id,
+                Vacancy.hr_id, Vacancy.content_hash, Vacancy.created_at
+            ).outerjoin(Outbox, Outbox.vacancy_id == Vacancy.id).filter(
+                Vacancy.id > last_id,
+                Vacancy.created_at < cutoff,
+                Vacancy.archived_at == None,
+                or_(Outbox.id == None, Outbox.status.in_(['sent', 'failed']))
+            ).order_by(Vacancy.id).limit(batch_size)).all()
+            if not rows:
+                break
+            by_file = defaultdict(list)
+            for row in rows:
+                by_file[archive_path(archive_dir, row.created_at)].append(row)
+            for path, items in by_file.items():
+                with gzip.open(path, 'at', encoding='utf-8') as f:
+                    for row in items:
+                        f.write(json.dumps({
+                            'id': row.id,
+                            'title': row.title,
+                            'text': row.text,
+                            'score': row.score,
+                            'chat_id': row.chat_id,
+                            'hr_id': row.hr_id,
+                            'content_hash': row.content_hash,
+                            'created_at': row.created_at.isoformat(),
+                        }, ensure_ascii=False) + '\n')
+            now = datetime.now()
+            session.execute(update(Vacancy), [{'id': row.id, 'text': '', 'archived_at': now} for row in rows])
+            last_id = rows[-1].id
+        archived += len(rows)
+        logger.info(f"Archived {archived} vacancies")
+    return archived
+
+
+def read_archived(archive_dir, vacancy_id, created_at):
+    path = archive_path(archive_dir, created_at)
+    if not path.exists():
+        return None
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            if record['id'] == vacancy_id:
+                return record
+    return None
+
+
+def run_retention(message_days, vacancy_days, archive_dir=None):
+    deleted = compact_messages(message_days) if message_days else 0
+    archived = archive_vacancies(vacancy_days, archive_dir or get_archive_dir()) if vacancy_days else 0
+    logger.info(f"Retention: {deleted} messages compacted, {archived} vacancies archived")
+    return deleted, archived
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact old messages and archive old vacancy texts")
+    parser.add_argument('--message-days', type=int, default=int(os.getenv("MESSAGE_RETENTION_DAYS", "30")))
+    parser.add_argument('--vacancy-days', type=int, default=int(os.getenv("VACANCY_RETENTION_DAYS", "180")))
+    parser.add_argument('--archive-dir', type=Path, default=get_archive_dir())
+    args = parser.parse_args()
+    setup_logging()
+    deleted, archived = run_retention(args.message_days, args.vacancy_days, args.archive_dir)
+    print(f"{deleted} messages compacted, {archived} vacancies archived")
+
+
+if __name__ == "__main__":
+    main()
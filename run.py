@@ -1,12 +1,22 @@
+import os
 import asyncio
+import argparse
+import multiprocessing
+from pathlib import Path
 from pyrogram import idle
 from bot import JobBot
 from config import get_logger
+from metrics import start_metrics_server
+from logging_setup import setup_logging
 
 logger = get_logger(__name__)
 
 
 async def main():
+    metrics_port = int(os.getenv("METRICS_PORT", "9108"))
+    if metrics_port:
+        start_metrics_server(metrics_port, os.getenv("METRICS_ADDR", "127.0.0.1"))
+        logger.info(f"Metrics available on port {metrics_port}")
     bot = JobBot()
     
     try:
@@ -21,5 +31,49 @@ async def main():
         await bot.stop()
 
 
-if __name__ == "__main__":
+def run_worker(session_name, metrics_port):
+    os.environ["SESSION_NAME"] = session_name
+    os.environ["METRICS_PORT"] = str(metrics_port)
+    log_file = os.getenv("LOG_FILE", "logs/bot.log")
+    if log_file:
+        path = Path(log_file)
+        os.environ["LOG_FILE"] = str(path.with_name(f"{path.stem}-{session_name}{path.suffix}"))
+    setup_logging()
     asyncio.run(main())
+
+
+def run_all_sessions():
+    session_names = sorted(path.stem for path in Path("sessions").glob("*.session"))
+    if not session_names:
+        logger.error("No session files found in sessions/")
+        return
+    os.environ["SHARDING"] = "true"
+    metrics_port = int(os.getenv("METRICS_PORT", "9108"))
+    workers = [
+        multiprocessing.Process(
+            target=run_worker,
+            args=(name, metrics_port + i if metrics_port else 0),
+            name=f"worker-{name}",
+        )
+        for i, name in enumerate(session_names)
+    ]
+    logger.info(f"Starting {len(workers)} workers: {', '.join(session_names)}")
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the job bot")
+    parser.add_argument('--all-sessions', action='store_true', help="run one sharded worker per sessions/*.session file")
+    args = parser.parse_args()
+    setup_logging()
+    if args.all_sessions:
+        run_all_sessions()
+    else:
+        asyncio.run(main())
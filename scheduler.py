@@ -0,0 +1,75 @@
+import heapq
+
+
+class PollScheduler:
+    def __init__(self, min_interval=30, max_interval=3600, history_limit=10, coverage=0.5, boost=2.0, window=86400):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.history_limit = history_limit
+        self.coverage = coverage
+        self.boost = boost
+        self.window = window
+        self.heap = []
+        self.due_at = {}
+        self.polled_at = {}
+        self.intervals = {}
+        self.saturated = set()
+
+    def __len__(self):
+        return len(self.due_at)
+
+    def interval_for(self, messages, vacancies):
+        if not messages:
+            return self.max_interval
+        rate = messages / self.window
+        interval = self.coverage * self.history_limit / rate
+        interval /= 1 + self.boost * min(vacancies / messages, 1)
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def _schedule(self, chat_id, due_at):
+        self.due_at[chat_id] = due_at
+        heapq.heappush(self.heap, (due_at, chat_id))
+
+    def sync(self, chat_ids, activity, now):
+        for chat_id in set(self.due_at) - set(chat_ids):
+            del self.due_at[chat_id]
+            self.polled_at.pop(chat_id, None)
+            self.intervals.pop(chat_id, None)
+        for chat_id in chat_ids:
+            interval = self.interval_for(*activity.get(chat_id, (0, 0)))
+            if chat_id in self.saturated and chat_id in self.intervals:
+                interval = max(min(interval, self.intervals[chat_id] / 2), self.min_interval)
+            self.intervals[chat_id] = interval
+            if chat_id not in self.due_at:
+                self._schedule(chat_id, now)
+            else:
+                due_at = self.polled_at.get(chat_id, now) + interval
+                if due_at < self.due_at[chat_id]:
+                    self._schedule(chat_id, due_at)
+        self.saturated.clear()
+
+    def expedite(self, now):
+        for chat_id in self.due_at:
+            self._schedule(chat_id, now)
+
+    def pop_due(self, now):
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            due_at, chat_id = heapq.heappop(self.heap)
+            if self.due_at.get(chat_id) == due_at:
+                del self.due_at[chat_id]
+                due.append(chat_id)
+        return due
+
+    def reschedule(self, chat_id, now, saturated=False):
+        self.polled_at[chat_id] = now
+        if saturated:
+            self.saturated.add(chat_id)
+            self._schedule(chat_id, now + self.min_interval)
+        else:
+            self._schedule(chat_id, now + self.intervals.get(chat_id, self.max_interval))
+
+    def next_due(self):
+        while self.heap and self.due_at.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else None
@@ -0,0 +1,99 @@
+import re
+import argparse
+from sqlalchemy import func, literal_column, select, table, column
+from config import session_scope
+from models import Chat, Vacancy
+
+QUERY_TOKEN_PATTERN = re.compile(r'\w+')
+POSTGRES_CONFIGS = ('russian', 'english')
+TITLE_WEIGHT = 5.0
+SNIPPET_WORDS = 16
+
+vacancies_fts = table('vacancies_fts', column('rowid'))
+
+
+def fts_query(query):
+    return ' '.join(f'"{token}"*' for token in QUERY_TOKEN_PATTERN.findall(query.lower()))
+
+
+def _match_postgresql(stmt, query):
+    vector = literal_column('vacancies.search_vector')
+    tsquery = None
+    for config in POSTGRES_CONFIGS:
+        part = func.websearch_to_tsquery(literal_column(f"'{config}'::regconfig"), query)
+        tsquery = part if tsquery is None else tsquery.op('||')(part)
+    rank = func.ts_rank_cd(vector, tsquery).label('rank')
+    snippet = func.ts_headline(
+        literal_column(f"'{POSTGRES_CONFIGS[0]}'::regconfig"), Vacancy.text, tsquery,
+        f'StartSel=[, StopSel=], MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}'
+    )
+    return stmt.add_columns(rank, snippet.label('snippet')).filter(vector.op('@@')(tsquery)), rank
+
+
+def _match_sqlite(stmt, query):
+    fts = literal_column('vacancies_fts')
+    rank = (-func.bm25(fts, TITLE_WEIGHT, 1.0)).label('rank')
+    snippet = func.snippet(fts, 1, '[', ']', '…', SNIPPET_WORDS)
+    stmt = stmt.add_columns(rank, snippet.label('snippet')).join(
+        vacancies_fts, vacancies_fts.c.rowid == Vacancy.id
+    ).filter(fts.op('MATCH')(fts_query(query)))
+    return stmt, rank
+
+
+def search_vacancies(session, query=None, min_score=None, chat_id=None, replied=None, limit=20, offset=0):
+    score = func.coalesce(Vacancy.combined_score, Vacancy.score)
+    stmt = select(
+        Vacancy.id, Vacancy.title, score.label('score'), Chat.title.label('chat'),
+        Vacancy.replied_at, Vacancy.archived_at, Vacancy.created_at
+    ).join(Chat, Chat.id == Vacancy.chat_id)
+    order = Vacancy.id.desc()
+    if query:
+        if session.bind.dialect.name == 'postgresql':
+            stmt, order = _match_postgresql(stmt, query)
+        else:
+            if not fts_query(query):
+                return []
+            stmt, order = _match_sqlite(stmt, query)
+        order = order.desc()
+    if min_score is not None:
+        stmt = stmt.filter(score >= min_score)
+    if chat_id is not None:
+        stmt = stmt.filter(Vacancy.chat_id == chat_id)
+    if replied is not None:
+        stmt = stmt.filter(Vacancy.replied_at.isnot(None) if replied else Vacancy.replied_at.is_(None))
+    stmt = stmt.order_by(order, Vacancy.id.desc()).limit(limit).offset(offset)
+    return session.execute(stmt).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search stored vacancies")
+    parser.add_argument('query', nargs='?', help="Keywords; Postgres also accepts quoted phrases, OR and -exclusions")
+    parser.add_argument('--min-score', type=float)
+    parser.add_argument('--chat-id', type=int, help="Database id of the chat")
+    replied = parser.add_mutually_exclusive_group()
+    replied.add_argument('--replied', dest='replied', action='store_true', default=None)
+    replied.add_argument('--not-replied', dest='replied', action='store_false')
+    parser.add_argument('--page', type=int, default=1)
+    parser.add_argument('--per-page', type=int, default=20)
+    args = parser.parse_args()
+    with session_scope() as session:
+        rows = search_vacancies(
+            session, args.query, args.min_score, args.chat_id, args.replied,
+            limit=args.per_page + 1, offset=(args.page - 1) * args.per_page
+        )
+    for row in rows[:args.per_page]:
+        flags = ''.join([' replied' if row.replied_at else '', ' archived' if row.archived_at else ''])
+        rank = f" rank {row.rank:.3f}" if args.query else ''
+        print(f"#{row.id} [{row.score:.0f}{rank}] {row.title} — {row.chat}, {row.created_at:%Y-%m-%d}{flags}")
+        if args.query and row.snippet:
+            print(f"    {' '.join(row.snippet.split())}")
+    if not rows:
+        print("No vacancies found")
+    elif len(rows) > args.per_page:
+        print(f"Page {args.page}, more results with --page {args.page + 1}")
+    else:
+        print(f"Page {args.page}, no more results")
+
+
+if __name__ == "__main__":
+    main()
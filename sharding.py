@@ -0,0 +1,99 @@
+import hashlib
+from datetime import datetime, timedelta
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from config import get_logger
+from models import Chat, Worker, WorkerChat
+
+logger = get_logger(__name__)
+
+
+def rendezvous_score(worker, chat_id):
+    digest = hashlib.blake2b(f"{worker}:{chat_id}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def _insert(session, model):
+    dialect = postgresql if session.bind.dialect.name == 'postgresql' else sqlite
+    return dialect.insert(model)
+
+
+class ShardCoordinator:
+    def __init__(self, worker_name, lease_ttl=300):
+        self.worker_name = worker_name
+        self.lease_ttl = lease_ttl
+        self.live_workers = {worker_name}
+        self.leased = set()
+
+    async def heartbeat(self, session):
+        now = datetime.now()
+        values = {'heartbeat_at': now}
+        stmt = _insert(session, Worker).values(name=self.worker_name, started_at=now, **values)
+        await session.execute(stmt.on_conflict_do_update(index_elements=['name'], set_=values))
+        cutoff = now - timedelta(seconds=self.lease_ttl)
+        self.live_workers = set(await session.scalars(select(Worker.name).filter(Worker.heartbeat_at >= cutoff)))
+        self.live_workers.add(self.worker_name)
+        await session.commit()
+
+    async def sync_membership(self, session, chat_ids):
+        chat_ids = set(chat_ids)
+        if chat_ids:
+            await session.execute(_insert(session, WorkerChat).values([
+                {'worker': self.worker_name, 'chat_id': chat_id} for chat_id in chat_ids
+            ]).on_conflict_do_nothing(index_elements=['worker', 'chat_id']))
+        await session.execute(delete(WorkerChat).filter(
+            WorkerChat.worker == self.worker_name,
+            WorkerChat.chat_id.not_in(chat_ids)
+        ))
+        await session.commit()
+
+    async def owned_chats(self, session, chat_ids):
+        candidates = {}
+        rows = await session.execute(select(WorkerChat.chat_id, WorkerChat.worker).filter(
+            WorkerChat.chat_id.in_(chat_ids),
+            WorkerChat.worker.in_(self.live_workers)
+        ))
+        for chat_id, worker in rows:
+            candidates.setdefault(chat_id, []).append(worker)
+        return {
+            chat_id for chat_id in chat_ids
+            if max(candidates.get(chat_id, [self.worker_name]), key=lambda w: rendezvous_score(w, chat_id))
+            == self.worker_name
+        }
+
+    async def rebalance(self, session, chat_ids):
+        await self.heartbeat(session)
+        owned = await self.owned_chats(session, chat_ids)
+        now = datetime.now()
+        released = set(await session.scalars(update(Chat).filter(
+            Chat.lease_owner == self.worker_name,
+            Chat.id.not_in(owned)
+        ).values(lease_owner=None, lease_expires_at=None).returning(Chat.id)))
+        leased = set()
+        if owned:
+            leased = set(await session.scalars(update(Chat).filter(
+                Chat.id.in_(owned),
+                (Chat.lease_owner == None) | (Chat.lease_owner == self.worker_name) | (Chat.lease_expires_at < now)
+            ).values(
+                lease_owner=self.worker_name,
+                lease_expires_at=now + timedelta(seconds=self.lease_ttl)
+            ).returning(Chat.id)))
+        await session.commit()
+        gained = leased - self.leased
+        if gained or released:
+            logger.info(
+                f"Worker {self.worker_name} leases {len(leased)} chats "
+                f"(+{len(gained)}, -{len(released)}, {len(owned) - len(leased)} pending, "
+                f"{len(self.live_workers)} live workers)"
+            )
+        self.leased = leased
+        return leased
+
+    async def release(self, session):
+        await session.execute(update(Chat).filter(Chat.lease_owner == self.worker_name).values(
+            lease_owner=None, lease_expires_at=None
+        ))
+        await session.execute(delete(WorkerChat).filter(WorkerChat.worker == self.worker_name))
+        await session.execute(delete(Worker).filter(Worker.name == self.worker_name))
+        await session.commit()
+        self.leased = set()
@@ -0,0 +1,74 @@
+from collections import Counter, defaultdict
+from datetime import datetime
+from sqlalchemy import text
+from config import session_scope
+
+
+COUNTERS = (
+    'messages_seen',
+    'vacancies_found',
+    'applied_to_hr',
+    'applied_to_host',
+    'replied_vacancies',
+)
+
+ROLLUP_VIEWS = (
+    'chat_stats',
+    'filter_stats',
+)
+
+
+class StatsBuffer:
+    def __init__(self):
+        self.buckets = defaultdict(Counter)
+
+    @staticmethod
+    def current_hour():
+        return datetime.now().replace(minute=0, second=0, microsecond=0)
+
+    def add(self, chat_id, **counts):
+        bucket = self.buckets[(self.current_hour(), chat_id)]
+        for name, value in counts.items():
+            if value:
+                bucket[name] += value
+
+    def drain(self):
+        buckets, self.buckets = self.buckets, defaultdict(Counter)
+        return buckets
+
+    def restore(self, buckets):
+        for key, counts in buckets.items():
+            self.buckets[key].update(counts)
+
+    def __len__(self):
+        return len(self.buckets)
+
+
+async def refresh_rollups(session):
+    if session.bind.dialect.name != 'postgresql':
+        return False
+    for view in ROLLUP_VIEWS:
+        await session.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}"))
+    return True
+
+
+def main():
+    with session_scope() as session:
+        print("Reply rate per chat:")
+        rows = session.execute(text(
+            "SELECT chats.title, s.messages_seen, s.vacancies_found, s.applied, s.replied_vacancies, s.reply_rate "
+            "FROM chat_stats s JOIN chats ON chats.id = s.chat_id ORDER BY s.vacancies_found DESC"
+        ))
+        for title, seen, found, applied, replied, rate in rows:
+            print(f"  {title}: {seen} messages, {found} vacancies, {applied} applied, {replied} replied ({rate or 0:.0%})")
+        print("Reply rate per filter:")
+        rows = session.execute(text(
+            "SELECT filters.title, s.vacancies, s.replied, s.reply_rate "
+            "FROM filter_stats s JOIN filters ON filters.id = s.filter_id ORDER BY s.vacancies DESC"
+        ))
+        for title, vacancies, replied, rate in rows:
+            print(f"  {title}: {vacancies} vacancies, {replied} replied ({rate or 0:.0%})")
+
+
+if __name__ == "__main__":
+    main()
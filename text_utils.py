@@ -0,0 +1,37 @@
+import re
+
+
+EMOJI_PATTERN = re.compile(
+    "["
+    "\U0001F600-\U0001F64F"
+    "\U0001F300-\U0001F5FF"
+    "\U0001F680-\U0001F6FF"
+    "\U0001F1E0-\U0001F1FF"
+    "\U00002702-\U000027B0"
+    "\U000024C2-\U0001F251"
+    "]+",
+    flags=re.UNICODE,
+)
+
+
+def remove_emojis(text):
+    if not text:
+        return text
+    return EMOJI_PATTERN.sub('', text)
+
+
+def sanitize_filename(name):
+    invalid = '<>:"/\\|?*\n\r\t'
+    result = ''.join('_' if ch in invalid else ch for ch in name).strip()
+    result = result[:120].rstrip('.')
+    return result or 'vacancy'
+
+
+def truncate_to_word(text, limit):
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    space_idx = cut.rfind(' ')
+    if space_idx == -1:
+        return cut.strip()
+    return cut[:space_idx].strip()